@@ -104,17 +104,20 @@ class NoCompression(CompressionBase):
 
     def extract(self, serialized_tensor: runtime_pb2.Tensor) -> torch.Tensor:
         shape = torch.Size(serialized_tensor.size)
+        # Each access to a protobuf bytes field materializes a new copy, so the field is read only once.
+        # The bytearray copy keeps the resulting tensor writable, and torch.as_tensor() shares its memory
+        buffer = bytearray(serialized_tensor.buffer)
         if serialized_tensor.dtype == "bfloat16":
             numel = shape.numel()
-            if numel > 0 and len(serialized_tensor.buffer) // numel == 4:
-                array = np.frombuffer(bytearray(serialized_tensor.buffer), dtype=np.float32)
+            if numel > 0 and len(buffer) // numel == 4:
+                array = np.frombuffer(buffer, dtype=np.float32)
                 tensor = torch.as_tensor(array, dtype=torch.bfloat16)
             else:
-                array = np.frombuffer(bytearray(serialized_tensor.buffer), dtype=np.int16)
+                array = np.frombuffer(buffer, dtype=np.int16)
                 # reinterpret_cast from an arbitrary 2-byte type supported by numpy
                 tensor = torch.as_tensor(array).view(torch.bfloat16)
         else:
-            array = np.frombuffer(bytearray(serialized_tensor.buffer), dtype=np.dtype(serialized_tensor.dtype))
+            array = np.frombuffer(buffer, dtype=np.dtype(serialized_tensor.dtype))
             tensor = torch.as_tensor(array)
         return tensor.reshape(shape)
 
@@ -37,7 +37,9 @@ def serialize_torch_tensor(
     """Serialize a given tensor into a protobuf message using the specified compression strategy"""
     assert tensor.device == torch.device("cpu")
     compression = _BASE_COMPRESSION_TYPES[runtime_pb2.CompressionType.Name(compression_type)]
-    info = info or CompressionInfo.from_tensor(tensor, **kwargs)
+    if info is None and compression_type != runtime_pb2.CompressionType.NONE:
+        # NoCompression ignores info, so uncompressed tensors (e.g. streamed tokens) skip building a descriptor
+        info = CompressionInfo.from_tensor(tensor, **kwargs)
     return compression.compress(tensor, info, allow_inplace)
 
 
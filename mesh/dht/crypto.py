@@ -1,11 +1,12 @@
-import dataclasses
 import re
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from mesh.dht.validation import DHTRecord, DHTRecordRequestType, RecordValidatorBase
 from mesh.utils import MSGPackSerializer, get_logger
 from mesh.utils.crypto import (
     Ed25519PrivateKey,
     KeyType,
+    PublicKey,
     RSAPrivateKey,
     load_public_key_from_bytes,
 )
@@ -33,6 +34,12 @@ class SignatureValidator(RecordValidatorBase):
     _PUBLIC_KEY_RE = re.compile(PUBLIC_KEY_REGEX)
     _SIGNATURE_RE = re.compile(re.escape(SIGNATURE_FORMAT).replace(b"_value_", rb"(.+?)"))
 
+    # The field delimiters are plain byte strings, so fields are located with bytes.find() instead of
+    # the regexes above, which are kept as the reference definition of the format
+    _PUBLIC_KEY_PREFIX = PUBLIC_KEY_FORMAT.split(b"_key_")[0]
+    _SIGNATURE_PREFIX = SIGNATURE_FORMAT.split(b"_value_")[0]
+    _FIELD_SUFFIX = b"]"
+
     _cached_private_key = None
 
     def __init__(self, private_key: RSAPrivateKey | Ed25519PrivateKey):
@@ -46,9 +53,17 @@ class SignatureValidator(RecordValidatorBase):
         return self._local_public_key
 
     def validate(self, record: DHTRecord, type: DHTRecordRequestType) -> bool:
-        public_keys = self._PUBLIC_KEY_RE.findall(record.key)
+        return self._validate(record, {})
+
+    def validate_many(self, records: Sequence[DHTRecord], type: DHTRecordRequestType) -> List[bool]:
+        # Records of a batch usually belong to a few owners, so each distinct public key is loaded only once
+        public_key_cache = {}
+        return [self._validate(record, public_key_cache) for record in records]
+
+    def _validate(self, record: DHTRecord, public_key_cache: Dict[bytes, PublicKey]) -> bool:
+        public_keys = self._extract_owners(record.key)
         if record.subkey is not None:
-            public_keys += self._PUBLIC_KEY_RE.findall(record.subkey)
+            public_keys += self._extract_owners(record.subkey)
         if not public_keys:
             return True  # The record is not protected with a public key
 
@@ -56,32 +71,92 @@ class SignatureValidator(RecordValidatorBase):
             logger.debug(f"Key and subkey can't contain different public keys in {record}")
             return False
 
-        public_key = load_public_key_from_bytes(public_keys[0])
+        public_key = public_key_cache.get(public_keys[0])
+        if public_key is None:
+            public_key = public_key_cache[public_keys[0]] = load_public_key_from_bytes(public_keys[0])
 
-        signatures = self._SIGNATURE_RE.findall(record.value)
+        # Finding a second signature is enough to reject the record, so the scan stops there
+        signatures = self._extract_signatures(record.value, limit=2)
         if len(signatures) != 1:
             logger.debug(f"Record should have exactly one signature in {record}")
             return False
         signature = signatures[0]
 
-        stripped_record = dataclasses.replace(record, value=self.strip_value(record))
-        if not public_key.verify(self._serialize_record(stripped_record), signature):
+        if not public_key.verify(self._serialize_record(record, value=self.strip_value(record)), signature):
             logger.debug(f"Signature is invalid in {record}")
             return False
         return True
 
     def sign_value(self, record: DHTRecord) -> bytes:
-        if self._local_public_key not in record.key and self._local_public_key not in record.subkey:
+        public_key = self._local_public_key
+        if public_key not in record.key and (record.subkey is None or public_key not in record.subkey):
             return record.value
 
         signature = self._private_key.sign(self._serialize_record(record))
         return record.value + self.SIGNATURE_FORMAT.replace(b"_value_", signature)
 
     def strip_value(self, record: DHTRecord) -> bytes:
-        return self._SIGNATURE_RE.sub(b"", record.value)
-
-    def _serialize_record(self, record: DHTRecord) -> bytes:
-        return MSGPackSerializer.dumps(dataclasses.astuple(record))
+        value = record.value
+        spans = self._field_spans(value, self._SIGNATURE_PREFIX)
+        if not spans:
+            return value
+        parts = []
+        pos = 0
+        for start, _, end in spans:
+            parts.append(value[pos:start])
+            pos = end + 1
+        parts.append(value[pos:])
+        return b"".join(parts)
+
+    @classmethod
+    def _extract_owners(cls, buf: bytes) -> list:
+        return cls._find_fields(buf, cls._PUBLIC_KEY_PREFIX)
+
+    @classmethod
+    def _extract_signatures(cls, buf: bytes, limit: Optional[int] = None) -> list:
+        return cls._find_fields(buf, cls._SIGNATURE_PREFIX, limit)
+
+    @classmethod
+    def _find_fields(cls, buf: bytes, prefix: bytes, limit: Optional[int] = None) -> list:
+        """Equivalent to `findall(buf)[:limit]` with the matching regex, but stops once `limit` fields are found"""
+        return [buf[begin:end] for _, begin, end in cls._field_spans(buf, prefix, limit)]
+
+    @classmethod
+    def _field_spans(cls, buf: bytes, prefix: bytes, limit: Optional[int] = None) -> List[Tuple[int, int, int]]:
+        """
+        Returns (field start, value start, value end) for each match of `prefix + b"(.+?)]"`, exactly as re.finditer()
+        would report them, in time linear in len(buf) even for malformed or adversarial inputs
+        """
+        spans = []
+        pos = 0
+        # Positions of the next b"]" and b"\n" found so far; both stay valid while they are ahead of the scan
+        end = newline = -1
+        while limit is None or len(spans) < limit:
+            start = buf.find(prefix, pos)
+            if start == -1:
+                break
+            begin = start + len(prefix)
+            if end < begin + 1:
+                end = buf.find(cls._FIELD_SUFFIX, begin + 1)  # "(.+?)" consumes at least one byte
+                if end == -1:
+                    break
+            if newline < begin:
+                newline = buf.find(b"\n", begin)
+                if newline == -1:
+                    newline = len(buf)
+            if newline < end:
+                # "." does not match newlines, so no field can start before this newline
+                pos = max(start + 1, newline - len(prefix) + 1)
+                continue
+            spans.append((start, begin, end))
+            pos = end + 1
+        return spans
+
+    def _serialize_record(self, record: DHTRecord, value: Optional[bytes] = None) -> bytes:
+        # Same layout as dataclasses.astuple(record), built without reflecting over the dataclass fields
+        if value is None:
+            value = record.value
+        return MSGPackSerializer.dumps((record.key, record.subkey, value, record.expiration_time))
 
     @property
     def priority(self) -> int:
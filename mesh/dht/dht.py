@@ -5,7 +5,7 @@ import multiprocessing as mp
 import os
 import signal
 from functools import partial
-from typing import Awaitable, Callable, Iterable, List, Optional, Sequence, TypeVar, Union
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, TypeVar, Union
 
 from mesh.dht.node import DEFAULT_NUM_WORKERS, DHTNode
 from mesh.dht.routing import DHTID, DHTKey, DHTValue, Subkey
@@ -238,6 +238,61 @@ class DHT(mp.context.ForkProcess):
                 future.set_exception(e)
             raise
 
+    def store_many(
+        self,
+        keys: Sequence[DHTKey],
+        values: Sequence[DHTValue],
+        expiration_time: Union[DHTExpiration, Sequence[DHTExpiration]],
+        subkeys: Optional[Sequence[Optional[Subkey]]] = None,
+        return_future: bool = False,
+        **kwargs,
+    ) -> Union[Dict[Any, bool], MPFuture]:
+        """
+        Store several (key, value) pairs in a single DHT traversal, see DHTNode.store_many.
+
+        :param expiration_time: either one expiration time for all keys or individual expiration times
+        :param subkeys: an optional list of same length as keys, with a subkey (or None) for each key
+        :param return_future: if False (default), return when finished. Otherwise return MPFuture and run in background.
+        :returns: for each key (or (key, subkey) pair): True if store succeeds, False if it fails
+        """
+        assert os.getpid() != self.pid, "calling *external* DHT interface from inside DHT will result in a deadlock"
+        if not isinstance(expiration_time, (int, float)):
+            expiration_time = list(expiration_time)
+        future = MPFuture()
+        self._outer_pipe.send(
+            (
+                "_store_many",
+                [],
+                dict(
+                    keys=list(keys),
+                    values=list(values),
+                    expiration_time=expiration_time,
+                    subkeys=None if subkeys is None else list(subkeys),
+                    future=future,
+                    **kwargs,
+                ),
+            )
+        )
+        return future if return_future else future.result()
+
+    async def _store_many(
+        self,
+        keys: List[DHTKey],
+        values: List[DHTValue],
+        expiration_time: Union[DHTExpiration, List[DHTExpiration]],
+        subkeys: Optional[List[Optional[Subkey]]],
+        future: MPFuture,
+        **kwargs,
+    ):
+        try:
+            result = await self._node.store_many(keys, values, expiration_time, subkeys=subkeys, **kwargs)
+            if not future.done():
+                future.set_result(result)
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+            raise
+
     def run_coroutine(
         self, coro: Callable[[DHT, DHTNode], Awaitable[ReturnType]], return_future: bool = False
     ) -> Union[ReturnType, MPFuture[ReturnType]]:
@@ -420,12 +420,11 @@ class DHTProtocol(ServicerBase):
             return True
 
         with dictionary.freeze():
-            for subkey, (value_bytes, expiration_time) in dictionary.items():
-                subkey_bytes = self.serializer.dumps(subkey)
-                record = DHTRecord(key_bytes, subkey_bytes, value_bytes, expiration_time)
-                if not self.record_validator.validate(record, type):
-                    return False
-        return True
+            records = [
+                DHTRecord(key_bytes, self.serializer.dumps(subkey), value_bytes, expiration_time)
+                for subkey, (value_bytes, expiration_time) in dictionary.items()
+            ]
+        return all(self.record_validator.validate_many(records, type))
 
 
 class ValidationError(Exception):
@@ -1,16 +1,27 @@
 import dataclasses
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Callable, Iterable
+from typing import Callable, Iterable, List, Sequence
 
 
 @dataclasses.dataclass(init=True, repr=True, frozen=True)
 class DHTRecord:
+    # Declared by hand since dataclass(slots=True) requires Python 3.10+
+    __slots__ = ("key", "subkey", "value", "expiration_time")
+
     key: bytes
     subkey: bytes
     value: bytes
     expiration_time: float
 
+    def __getstate__(self):
+        return self.key, self.subkey, self.value, self.expiration_time
+
+    def __setstate__(self, state):
+        # The default slots unpickling uses setattr(), which a frozen dataclass forbids
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
 class DHTRecordRequestType(Enum):
     GET = "get"
     POST = "post"
@@ -35,6 +46,16 @@ class RecordValidatorBase(ABC):
 
         pass
 
+    def validate_many(self, records: Sequence[DHTRecord], type: DHTRecordRequestType) -> List[bool]:
+        """
+        Should return whether each of the `records` is valid, in the same order.
+
+        Note: there's no need to overwrite this method unless a validator can share work
+        between the records of a batch (e.g. parsing the same public key only once).
+        """
+
+        return [self.validate(record, type) for record in records]
+
     def sign_value(self, record: DHTRecord) -> bytes:
         """
         Should return `record.value` extended with the record's signature.
@@ -115,6 +136,23 @@ class CompositeValidator(RecordValidatorBase):
                 record = dataclasses.replace(record, value=validator.strip_value(record))
         return True
 
+    def validate_many(self, records: Sequence[DHTRecord], type: DHTRecordRequestType) -> List[bool]:
+        records = list(records)
+        results = [True] * len(records)
+        pending = list(range(len(records)))
+        for i, validator in enumerate(reversed(self._validators)):
+            if not pending:
+                break
+            verdicts = validator.validate_many([records[j] for j in pending], type)
+            for j, is_valid in zip(pending, verdicts):
+                if not is_valid:
+                    results[j] = False
+            pending = [j for j in pending if results[j]]
+            if i < len(self._validators) - 1:
+                for j in pending:
+                    records[j] = dataclasses.replace(records[j], value=validator.strip_value(records[j]))
+        return results
+
     def sign_value(self, record: DHTRecord) -> bytes:
         for validator in self._validators:
             record = dataclasses.replace(record, value=validator.sign_value(record))
@@ -0,0 +1,26 @@
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from dotenv import dotenv_values
+
+
+class Settings(NamedTuple):
+    local_rpc: Optional[str]
+    dev_rpc: Optional[str]
+    phrase: Optional[str]
+
+
+@lru_cache(maxsize=1)
+def settings() -> Settings:
+    """
+    Reads `.env` from the working directory once and returns the values shared by the CLIs.
+    Like load_dotenv(), variables already set in the environment take precedence, but os.environ is left untouched
+    """
+    env = dotenv_values(os.path.join(Path.cwd(), '.env'))
+
+    def get(key: str) -> Optional[str]:
+        return os.environ.get(key, env.get(key))
+
+    return Settings(local_rpc=get('LOCAL_RPC'), dev_rpc=get('DEV_RPC'), phrase=get('PHRASE'))
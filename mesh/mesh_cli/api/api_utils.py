@@ -1,7 +1,12 @@
-import json
+import hashlib
+import os
 import secrets
+from array import array
+from bisect import bisect_left
 from pathlib import Path
-from typing import Dict, List
+from typing import Container, Dict, Iterable, List
+
+import orjson
 
 from mesh.utils.logging import get_logger
 
@@ -13,21 +18,61 @@ KEYS_FILE = "bootnode_utils/bootnode_rest_keys.json"
 # Load keys at startup
 def load_api_keys() -> List[Dict]:
     try:
-        with open(KEYS_FILE, 'r') as f:
-            data = json.load(f)
-            return data
+        with open(KEYS_FILE, 'rb') as f:
+            return orjson.loads(f.read())
     except Exception as e:
         logger.error(f"Error loading API keys: {e}")
         return []
 
-def get_active_keys(keys: List[Dict]) -> set[str]:
-    return {entry["key"] for entry in keys if entry.get("active", True)}
+# Above this many active keys, get_active_keys() returns a CompactKeySet instead of a frozenset
+COMPACT_KEY_SET_THRESHOLD = 50_000
+
+class CompactKeySet:
+    """
+    Memory-efficient membership test for very large key sets.
+
+    Stores a sorted array of salted 64-bit key digests (8 bytes per key instead of a Python str in a set)
+    and looks them up with a binary search. The salt is random per instance, so a false positive
+    (probability ~ len(keys) / 2**64) cannot be provoked by crafting keys.
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        self._salt = secrets.token_bytes(16)
+        self._digests = array("Q", sorted({self._digest(key) for key in keys}))
+
+    def _digest(self, key: str) -> int:
+        digest = hashlib.blake2b(key.encode(), digest_size=8, key=self._salt).digest()
+        return int.from_bytes(digest, "little")
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        digest = self._digest(key)
+        index = bisect_left(self._digests, digest)
+        return index < len(self._digests) and self._digests[index] == digest
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+def index_active_keys(keys: List[Dict]) -> Dict[str, Dict]:
+    return {entry["key"]: entry for entry in keys if entry.get("active", True)}
+
+def get_active_keys(keys: List[Dict]) -> Container[str]:
+    """Returns the active keys indexed to their entries, or a CompactKeySet for very large key sets"""
+    active_keys = index_active_keys(keys)
+    if len(active_keys) > COMPACT_KEY_SET_THRESHOLD:
+        return CompactKeySet(active_keys)
+    return active_keys
 
 def save_api_keys(keys):
     try:
-        with open(KEYS_FILE, 'w') as f:
-            json.dump(keys, f, indent=4)
-            logger.info(f"Saved keys to {KEYS_FILE}")
+        data = orjson.dumps(keys, option=orjson.OPT_INDENT_2)
+        # Write to a temporary file and swap it in so readers never observe a partially written file
+        tmp_file = f"{KEYS_FILE}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, KEYS_FILE)
+        logger.info(f"Saved keys to {KEYS_FILE}")
     except Exception as e:
         logger.error(f"Error saving API keys {e}", exc_info=True)
 
@@ -35,18 +80,23 @@ def add_api_key(owner: str, key: str = None, active: bool = True):
     keys = load_api_keys()
     if key is None:
         key = f"key-{owner}-{secrets.token_hex(6)}"  # noqa: F821
+    by_key = {entry["key"]: entry for entry in keys}
+    by_owner = {}
+    for entry in keys:
+        by_owner.setdefault(entry["owner"], entry)
+
     # Check for duplicates
-    if any(k["key"] == key for k in keys):
+    if key in by_key:
         logger.info(f"Key {key} already exists!")
         return
     # Look for existing entry for this owner
-    for entry in keys:
-        if entry["owner"] == owner:
-            entry["key"] = key
-            entry["active"] = active
-            save_api_keys(keys)
-            logger.info(f"Updated API key for {owner}: {key}")
-            return
+    entry = by_owner.get(owner)
+    if entry is not None:
+        entry["key"] = key
+        entry["active"] = active
+        save_api_keys(keys)
+        logger.info(f"Updated API key for {owner}: {key}")
+        return
 
     keys.append({"owner": owner, "key": key, "active": active})
     save_api_keys(keys)
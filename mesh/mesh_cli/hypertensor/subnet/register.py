@@ -1,16 +1,9 @@
 import argparse
-import os
-from pathlib import Path
-
-from dotenv import load_dotenv
 
+from mesh.mesh_cli._settings import settings
 from mesh.substrate.chain_functions import Hypertensor, KeypairFrom
 from mesh.utils.logging import get_logger
 
-load_dotenv(os.path.join(Path.cwd(), '.env'))
-
-PHRASE = os.getenv('PHRASE')
-
 logger = get_logger(__name__)
 
 """
@@ -92,16 +85,16 @@ def main():
     private_key = args.private_key
 
     if local_rpc:
-        rpc = os.getenv('LOCAL_RPC')
+        rpc = settings().local_rpc
     else:
-        rpc = os.getenv('DEV_RPC')
+        rpc = settings().dev_rpc
 
     if phrase is not None:
         hypertensor = Hypertensor(rpc, phrase)
     elif private_key is not None:
         hypertensor = Hypertensor(rpc, private_key, KeypairFrom.PRIVATE_KEY)
     else:
-        hypertensor = Hypertensor(rpc, PHRASE)
+        hypertensor = Hypertensor(rpc, settings().phrase)
 
     hotkey = hypertensor.keypair.ss58_address
     max_cost = int(args.max_cost * 1e18)
@@ -2,24 +2,30 @@
 !See README.md
 """
 
+import asyncio
+import functools
 import os
+import time
 from argparse import ArgumentParser
-from pathlib import Path
+from collections import OrderedDict
+from enum import Enum
 from secrets import token_hex
 from signal import SIGINT, SIGTERM, signal, strsignal
 from threading import Event, Thread
+from typing import Container, Optional, Tuple
 
+import orjson
 import uvicorn
-from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, HTTPException, Request, Security
+from fastapi import Depends, FastAPI, HTTPException, Request, Response, Security
+from fastapi.responses import ORJSONResponse
 from fastapi.security import APIKeyHeader
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
-from starlette.status import HTTP_403_FORBIDDEN
+from starlette.status import HTTP_403_FORBIDDEN, HTTP_429_TOO_MANY_REQUESTS
 
 from mesh.dht import DHT, DHTNode
 from mesh.dht.crypto import SignatureValidator
-from mesh.mesh_cli.api.api_utils import get_active_keys, load_api_keys
+from mesh.mesh_cli._settings import settings
+from mesh.mesh_cli.api.api_utils import KEYS_FILE, get_active_keys, load_api_keys
+from mesh.p2p import PeerID
 from mesh.substrate.chain_functions import Hypertensor, KeypairFrom
 from mesh.substrate.mock.chain_functions import MockHypertensor
 from mesh.substrate.mock.local_chain_functions import LocalMockHypertensor
@@ -35,10 +41,6 @@ from mesh.utils.proof_of_stake import ProofOfStake
 use_mesh_log_handler("in_root_logger")
 logger = get_logger(__name__)
 
-load_dotenv(os.path.join(Path.cwd(), '.env'))
-
-PHRASE = os.getenv('PHRASE')
-
 dht: DHT = None
 
 """
@@ -112,20 +114,78 @@ server {
 API_KEY_NAME = "X-API-Key"
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
 
+# Active API keys, reloaded from KEYS_FILE only when its mtime changes
+_keys_cache = {"mtime": -1, "active": frozenset()}
+
+def get_cached_active_keys() -> Container[str]:
+    try:
+        mtime = os.stat(KEYS_FILE).st_mtime_ns
+    except OSError:
+        mtime = None
+    if mtime != _keys_cache["mtime"]:
+        _keys_cache["active"] = get_active_keys(load_api_keys())
+        _keys_cache["mtime"] = mtime
+    return _keys_cache["active"]
+
 async def get_api_key(api_key_header: str = Security(api_key_header)):
-    api_keys: set[str] = load_api_keys()
-    active_keys = get_active_keys(api_keys)
-    if api_key_header in active_keys:
+    if api_key_header in get_cached_active_keys():
         return api_key_header
     raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail="Invalid or missing API Key")
 
-app = FastAPI()
-# Limiter for API key
-key_limiter = Limiter(key_func=lambda request: request.state.api_key)
-# Limiter for IP
-ip_limiter = Limiter(key_func=lambda request: request.client.host)
-app.state.limiter = key_limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# Endpoints return ORJSONResponse directly, so payloads already made JSON-compatible by serialize_object
+# are encoded once by orjson without another jsonable_encoder pass
+app = FastAPI(default_response_class=ORJSONResponse)
+
+RATE_LIMIT = 5  # Requests per RATE_LIMIT_PERIOD, applied both per client IP and per API key
+RATE_LIMIT_PERIOD = 60.0
+
+class TokenBucket:
+    """
+    In-process token buckets, refilled at `rate` tokens per `per` seconds up to a burst of `rate`
+
+    At most MAX_BUCKETS are kept; past that, the least recently used bucket is evicted
+    """
+
+    __slots__ = ("buckets",)
+
+    MAX_BUCKETS = 10_000
+
+    def __init__(self):
+        self.buckets: OrderedDict[str, Tuple[float, float]] = OrderedDict()  # key -> (tokens, last update time)
+
+    def check(self, key: str, rate: int, per: float) -> bool:
+        now = time.monotonic()
+        tokens, updated_at = self.buckets.get(key, (rate, now))
+        tokens = min(rate, tokens + (now - updated_at) * rate / per)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+
+        self.buckets[key] = (tokens, now)
+        self.buckets.move_to_end(key)
+        if len(self.buckets) > self.MAX_BUCKETS:
+            self.buckets.popitem(last=False)
+        return allowed
+
+app.state.rate_limiter = TokenBucket()
+
+def _rate_limit_exceeded() -> HTTPException:
+    return HTTPException(
+        status_code=HTTP_429_TOO_MANY_REQUESTS,
+        detail=f"Rate limit exceeded: {RATE_LIMIT} per {RATE_LIMIT_PERIOD:.0f} seconds",
+    )
+
+async def rate_limit(request: Request):
+    bucket: TokenBucket = request.app.state.rate_limiter
+    client_host = request.client.host if request.client is not None else ""
+    if not bucket.check(f"ip:{client_host}", RATE_LIMIT, RATE_LIMIT_PERIOD):
+        raise _rate_limit_exceeded()
+
+    # Per-key buckets are only created for valid keys, so random keys can't churn the table.
+    # Invalid keys are rejected by `get_api_key`
+    api_key = request.state.api_key
+    if api_key in get_cached_active_keys() and not bucket.check(f"key:{api_key}", RATE_LIMIT, RATE_LIMIT_PERIOD):
+        raise _rate_limit_exceeded()
 
 # Middleware to attach api_key to request.state
 @app.middleware("http")
@@ -134,48 +194,43 @@ async def attach_api_key(request: Request, call_next):
     request.state.api_key = api_key
     return await call_next(request)
 
+@functools.singledispatch
 def serialize_object(obj):
     """Recursively serialize objects to JSON-compatible formats"""
-    # Handle None
-    if obj is None:
-        return None
+    # PeerID, enums and containers are handled by the registered overloads below
 
-    # Handle primitive types
-    if isinstance(obj, (str, int, float, bool)):
-        return obj
+    # Handle objects with __dict__ (most custom classes), skipping private/internal attributes
+    if hasattr(obj, '__dict__'):
+        return {key: serialize_object(value) for key, value in vars(obj).items() if not key.startswith('_')}
 
-    # Handle peer_id specifically (libp2p ID objects)
-    if hasattr(obj, '_b58_str'):
-        return obj._b58_str  # Return the base58 string representation
+    # Fallback to string representation
+    return str(obj)
 
-    # Handle enums
-    if hasattr(obj, 'value') and hasattr(obj, 'name'):
-        return obj.name
+@serialize_object.register(type(None))
+@serialize_object.register(str)
+@serialize_object.register(int)
+@serialize_object.register(float)
+def _serialize_primitive(obj):
+    return obj
 
-    # Handle lists/tuples
-    if isinstance(obj, (list, tuple)):
-        return [serialize_object(item) for item in obj]
+@serialize_object.register(PeerID)
+def _serialize_peer_id(obj: PeerID):
+    return obj.to_base58()
 
-    # Handle dictionaries
-    if isinstance(obj, dict):
-        return {key: serialize_object(value) for key, value in obj.items()}
+@serialize_object.register(Enum)
+def _serialize_enum(obj: Enum):
+    return obj.name
 
-    # Handle objects with __dict__ (most custom classes)
-    if hasattr(obj, '__dict__'):
-        result = {}
-        for key, value in obj.__dict__.items():
-            # Skip private/internal attributes
-            if key.startswith('_'):
-                continue
-            result[key] = serialize_object(value)
-        return result
+@serialize_object.register(list)
+@serialize_object.register(tuple)
+def _serialize_sequence(obj):
+    return [serialize_object(item) for item in obj]
 
-    # Fallback to string representation
-    return str(obj)
+@serialize_object.register(dict)
+def _serialize_dict(obj: dict):
+    return {key: serialize_object(value) for key, value in obj.items()}
 
-@app.get("/get_heartbeat")
-@ip_limiter.limit("5/minute")
-@key_limiter.limit("5/minute")
+@app.get("/get_heartbeat", dependencies=[Depends(rate_limit)])
 async def get_heartbeat(
     request: Request,
     api_key: str = Depends(get_api_key)
@@ -184,7 +239,7 @@ async def get_heartbeat(
     Query the DHT for the subnets heartbeats.
     """
     if dht is None:
-        return {"error": "DHT not initialized"}
+        return ORJSONResponse({"error": "DHT not initialized"})
     results = get_node_heartbeats(
         dht,
         uid="node",
@@ -193,15 +248,19 @@ async def get_heartbeat(
     if results:
         try:
             serialized_results = serialize_object(results)
-            return {"value": serialized_results}
+            return ORJSONResponse({"value": serialized_results})
         except Exception as e:
             logger.warning(f"Error returning heartbeat {e}", exc_info=True)
-            return {"error": str(e)}
-    return {"value": None}
+            return ORJSONResponse({"error": str(e)})
+    return ORJSONResponse({"value": None})
+
+# Visible multiaddrs rarely change, so they are fetched from the DHT at most once per MADDRS_CACHE_TTL seconds
+MADDRS_CACHE_TTL = 10.0
+# The response body is encoded when the cache is refreshed and served as-is until the next refresh
+_maddrs_cache = {"time": 0.0, "body": None}
+_maddrs_cache_lock: Optional[asyncio.Lock] = None  # Created on first use inside the API server's event loop
 
-@app.get("/get_bootnodes")
-@ip_limiter.limit("5/minute")
-@key_limiter.limit("5/minute")
+@app.get("/get_bootnodes", dependencies=[Depends(rate_limit)])
 async def get_bootnodes(
     request: Request,
     api_key: str = Depends(get_api_key)
@@ -210,22 +269,19 @@ async def get_bootnodes(
     Query the DHT bootnodes.
     """
     if dht is None:
-        return {"error": "DHT not initialized"}
-    visible_maddrs = dht.get_visible_maddrs()
-    if visible_maddrs:
-        try:
-            addrs = []
-            for addr in visible_maddrs:
-                addrs.append(str(addr))
-            return {"value": addrs}
-        except Exception as e:
-            logger.warning(f"Error returning heartbeat {e}", exc_info=True)
-
-    return {"value": None}
-
-@app.get("/get_peers_info")
-@ip_limiter.limit("5/minute")
-@key_limiter.limit("5/minute")
+        return ORJSONResponse({"error": "DHT not initialized"})
+    global _maddrs_cache_lock
+    if _maddrs_cache_lock is None:
+        _maddrs_cache_lock = asyncio.Lock()
+    async with _maddrs_cache_lock:
+        if _maddrs_cache["body"] is None or time.monotonic() - _maddrs_cache["time"] >= MADDRS_CACHE_TTL:
+            visible_maddrs = dht.get_visible_maddrs()
+            addrs = [str(addr) for addr in visible_maddrs] if visible_maddrs else None
+            _maddrs_cache["body"] = orjson.dumps({"value": addrs})
+            _maddrs_cache["time"] = time.monotonic()
+    return Response(content=_maddrs_cache["body"], media_type="application/json")
+
+@app.get("/get_peers_info", dependencies=[Depends(rate_limit)])
 async def get_peers_info(
     request: Request,
     api_key: str = Depends(get_api_key)
@@ -234,23 +290,34 @@ async def get_peers_info(
     Query the DHT bootnodes.
     """
     if dht is None:
-        return {"error": "DHT not initialized"}
-
-    peers_info = {str(peer.peer_id): {"location": extract_peer_ip_info(str(peer.addrs[0])), "multiaddrs": [str(multiaddr) for multiaddr in peer.addrs]} for peer in dht.run_coroutine(get_peers_ips)}
+        return ORJSONResponse({"error": "DHT not initialized"})
+
+    peers = dht.run_coroutine(get_peers_ips)
+    peers_addrs = [[str(multiaddr) for multiaddr in peer.addrs] for peer in peers]
+    # Location lookups may hit the network, so uncached ones run concurrently in the default executor
+    loop = asyncio.get_running_loop()
+    locations = await asyncio.gather(
+        *(loop.run_in_executor(None, extract_peer_ip_info, addrs[0]) for addrs in peers_addrs)
+    )
+    peers_info = {
+        str(peer.peer_id): {"location": location, "multiaddrs": addrs}
+        for peer, addrs, location in zip(peers, peers_addrs, locations)
+    }
     if peers_info:
         try:
             serialized_results = serialize_object(peers_info)
-            return {"value": serialized_results}
+            return ORJSONResponse({"value": serialized_results})
         except Exception as e:
             logger.warning(f"Error returning heartbeat {e}", exc_info=True)
 
-    return {"value": None}
+    return ORJSONResponse({"value": None})
 
 
 
 
 def run_api():
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # A single worker is required since the endpoints share this process's `dht` handle
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools", workers=1, access_log=False)
 
 """
 Bootnode
@@ -330,16 +397,16 @@ def main():
 
     if no_blockchain_rpc is False:
         if local_rpc:
-            rpc = os.getenv('LOCAL_RPC')
+            rpc = settings().local_rpc
         else:
-            rpc = os.getenv('DEV_RPC')
+            rpc = settings().dev_rpc
 
         if phrase is not None:
             hypertensor = Hypertensor(rpc, phrase)
         elif private_key is not None:
             hypertensor = Hypertensor(rpc, private_key, KeypairFrom.PRIVATE_KEY)
         else:
-            hypertensor = Hypertensor(rpc, PHRASE)
+            hypertensor = Hypertensor(rpc, settings().phrase)
     else:
         # hypertensor = MockHypertensor()
         peer_id = get_peer_id_from_identity_path(args.identity_path)
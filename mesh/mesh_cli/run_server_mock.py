@@ -1,31 +1,27 @@
 import argparse
-import logging
+import hashlib
+import json
 import os
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, List, Optional
 
-import configargparse
-import torch
-from dotenv import load_dotenv
-from substrateinterface import Keypair, KeypairType
-
-from mesh.subnet.server.server import Server
-from mesh.substrate.chain_functions import Hypertensor, KeypairFrom
-from mesh.substrate.mock.chain_functions import MockHypertensor
-from mesh.substrate.mock.local_chain_functions import LocalMockHypertensor
-from mesh.utils import limits
+from mesh.mesh_cli._settings import settings
 from mesh.utils.constants import PUBLIC_INITIAL_PEERS
 from mesh.utils.data_structures import ServerClass
 from mesh.utils.key import get_peer_id_from_identity_path
 from mesh.utils.logging import get_logger, use_mesh_log_handler
 
-load_dotenv(os.path.join(Path.cwd(), '.env'))
-
-PHRASE = os.getenv('PHRASE')
-
 use_mesh_log_handler("in_root_logger")
 
 logger = get_logger(__name__)
 
+DEFAULT_CONFIG_FILE = "config.yml"
+CACHE_DIR = Path.home() / ".cache" / "mesh"
+BOOTNODES_CACHE_TTL = 60.0  # reuse on-chain bootnodes fetched by a previous launch within this many seconds
+
 """
 A mock CLI
 
@@ -39,14 +35,12 @@ mesh-server-mock \
     --identity_path server3.id \
     --subnet_id 1 --subnet_node_id 2
 """
-def main():
+def _build_parser() -> argparse.ArgumentParser:
     # fmt:off
-    parser = configargparse.ArgParser(default_config_files=["config.yml"],
-                                      formatter_class=argparse.ArgumentDefaultsHelpFormatter)
-    parser.add('-c', '--config', required=False, is_config_file=True, help='config file path')
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('-c', '--config', required=False, help=f'config file path (default: {DEFAULT_CONFIG_FILE} if present)')
     parser.add_argument("--public_name", type=str, default=None, help="Public name to be reported in the leaderboard")
 
-    group = parser.add_mutually_exclusive_group(required=False)
     parser.add_argument('--port', type=int, required=False,
                         help='Port this server listens to. '
                              'This is a simplified way to set the --host_maddrs and --announce_maddrs options (see below) '
@@ -88,7 +82,92 @@ def main():
     parser.add_argument("--private_key", type=str, required=False, help="[Testing] Hypertensor blockchain private key")
 
     # fmt:on
-    args = vars(parser.parse_args())
+    return parser
+
+
+def _load_config_file(parser: argparse.ArgumentParser, argv: List[str]) -> argparse.Namespace:
+    """
+    Returns a namespace pre-seeded with the options from the config file, to be passed to parser.parse_args().
+    Options are matched to the parser's actions and converted with their types; the parser itself is not modified,
+    and command-line arguments override these values
+    """
+    config_parser = argparse.ArgumentParser(add_help=False)
+    config_parser.add_argument('-c', '--config')
+    config_path = config_parser.parse_known_args(argv)[0].config
+    if config_path is None:
+        if not os.path.isfile(DEFAULT_CONFIG_FILE):
+            return argparse.Namespace()
+        config_path = DEFAULT_CONFIG_FILE
+
+    import yaml
+
+    try:
+        with open(config_path) as f:
+            config = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)) or {}
+    except OSError as e:
+        parser.error(f"Cannot read config file {config_path}: {e}")
+
+    actions = {option.lstrip("-"): action for action in parser._actions for option in action.option_strings}
+    namespace = argparse.Namespace()
+    for key, value in config.items():
+        action = actions.get(key)
+        if action is None:
+            parser.error(f"Unrecognized option in config file {config_path}: {key}")
+        if action.nargs == 0:  # store_true / store_false flags
+            if value:
+                setattr(namespace, action.dest, action.const)
+            continue
+
+        # Unlike parser defaults, values in the namespace are not converted by argparse
+        def convert(item: Any) -> Any:
+            if action.type is None or not isinstance(item, str):
+                return item
+            try:
+                return action.type(item)
+            except ValueError:
+                parser.error(f"Invalid value in config file {config_path} for {key}: {item!r}")
+
+        if action.nargs in ("+", "*"):
+            value = [convert(item) for item in (value if isinstance(value, list) else [value])]
+        else:
+            value = convert(value)
+        setattr(namespace, action.dest, value)
+    return namespace
+
+
+def _get_bootnodes(hypertensor, rpc: Optional[str], subnet_id: int):
+    """Fetch the on-chain bootnodes, reusing the result of a recent launch with the same RPC and subnet"""
+    from mesh.substrate.chain_data import AllSubnetBootnodes
+
+    cache_path = CACHE_DIR / f"bootnodes-{hashlib.sha256(f'{rpc}:{subnet_id}'.encode()).hexdigest()}.json"
+    try:
+        with open(cache_path) as f:
+            cached = json.load(f)
+        if time.time() - cached["ts"] < BOOTNODES_CACHE_TTL:
+            return AllSubnetBootnodes(bootnodes=cached["bootnodes"], node_bootnodes=cached["node_bootnodes"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass  # missing, unreadable or malformed cache: fetch from the chain
+
+    bootnodes = hypertensor.get_bootnodes_formatted(subnet_id)
+    if bootnodes is not None:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(
+                    {"ts": time.time(), "bootnodes": bootnodes.bootnodes, "node_bootnodes": bootnodes.node_bootnodes},
+                    f,
+                )
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError) as e:
+            logger.debug(f"Failed to write cache file {cache_path}: {e}")
+    return bootnodes
+
+
+def main():
+    argv = sys.argv[1:]
+    parser = _build_parser()
+    args = vars(parser.parse_args(argv, namespace=_load_config_file(parser, argv)))
     args.pop("config", None)
 
     subnet_id = args.pop("subnet_id", False)
@@ -118,26 +197,41 @@ def main():
     args["startup_timeout"] = args.pop("daemon_startup_timeout")
 
     file_limit = args.pop("increase_file_limit")
-    if file_limit:
-        limits.logger.setLevel(logging.WARNING)
-        limits.increase_file_limit(file_limit, file_limit)
+    if file_limit and os.name != "nt":
+        import resource
+
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (max(soft, file_limit), max(hard, file_limit)))
+        except (ValueError, OSError) as e:
+            logger.warning(f"Failed to increase file limit: {e}")
 
+    bootnodes_future: Optional[Future] = None
+
+    # Heavy modules are imported only once the arguments are parsed, so `-h` and argument errors return quickly
     if no_blockchain_rpc is False:
-        if local_rpc:
-            rpc = os.getenv('LOCAL_RPC')
-        else:
-            rpc = os.getenv('DEV_RPC')
+        from mesh.substrate.chain_functions import Hypertensor, KeypairFrom
+
+        env = settings()
+        rpc = env.local_rpc if local_rpc else env.dev_rpc
 
         if phrase is not None:
             hypertensor = Hypertensor(rpc, phrase)
         elif private_key is not None:
             hypertensor = Hypertensor(rpc, private_key, KeypairFrom.PRIVATE_KEY)
-            keypair = Keypair.create_from_private_key(private_key, crypto_type=KeypairType.ECDSA)
-            hotkey = keypair.ss58_address
-            logger.info("hotkey", hotkey)
+            logger.info(f"hotkey {hypertensor.hotkey}")
         else:
-            hypertensor = Hypertensor(rpc, PHRASE)
+            hypertensor = Hypertensor(rpc, env.phrase)
+
+        # Auto get the onchain bootnodes, fetching them in the background while the server modules are imported
+        # (a new swarm discards them anyway)
+        if not args["new_swarm"]:
+            executor = ThreadPoolExecutor(max_workers=1)
+            bootnodes_future = executor.submit(_get_bootnodes, hypertensor, rpc, subnet_id)
+            executor.shutdown(wait=False)
     else:
+        from mesh.substrate.mock.local_chain_functions import LocalMockHypertensor
+
         logger.info("Using MockHypertensor")
         # hypertensor = MockHypertensor()
         peer_id = get_peer_id_from_identity_path(args["identity_path"])
@@ -156,19 +250,22 @@ def main():
             reset_db=reset_db,
         )
 
-    # Auto get the onchain bootnodes
-    if isinstance(hypertensor, Hypertensor):
-        bootnodes = hypertensor.get_bootnodes_formatted(subnet_id)
-        if bootnodes is not None:
-            args["initial_peers"] = bootnodes
-
     if args.pop("new_swarm"):
         args["initial_peers"] = []
 
+    import torch
+
     if not torch.backends.openmp.is_available():
         # Necessary to prevent the server from freezing after forks
         torch.set_num_threads(1)
 
+    from mesh.subnet.server.server import Server
+
+    if bootnodes_future is not None:
+        bootnodes = bootnodes_future.result()
+        if bootnodes is not None:
+            args["initial_peers"] = bootnodes
+
     server = Server(
         **args,
         host_maddrs=host_maddrs,
@@ -2,12 +2,11 @@ from __future__ import annotations
 
 import asyncio
 import itertools
-import time
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, Dict, List, Optional
 
 import torch
 
-from mesh import deserialize_torch_tensor, get_logger, serialize_torch_tensor
+from mesh import PeerID, deserialize_torch_tensor, get_logger, serialize_torch_tensor
 from mesh.proto import inference_protocol_pb2
 from mesh.subnet.client.routing.routing_manager import RemoteManager
 from mesh.subnet.protocols.mock_protocol import MockProtocol
@@ -21,6 +20,8 @@ class Session:
     An interface to call inference on a peer hoster
     """
 
+    __slots__ = ("_remote_manager", "_server_session", "server", "_closed", "authorizer", "_stubs")
+
     def __init__(
         self,
         remote_manager: RemoteManager,
@@ -31,6 +32,8 @@ class Session:
         self.server = None
         self._closed = False
         self.authorizer = authorizer
+        # The p2p instance and authorizer are fixed for the session, so each peer's stub can be reused
+        self._stubs: Dict[PeerID, "InferenceProtocolStub"] = {}  # type: ignore # noqa: F821
 
     async def run_protocol_task(
         self,
@@ -38,7 +41,30 @@ class Session:
         tensor: torch.Tensor,
         max_retries: Optional[int] = 4,
     ) -> AsyncIterator[torch.Tensor]:
-        for attempt_no in itertools.count():
+        async for tensors in self.run_protocol_task_batched(prompt, tensor, max_retries):
+            for output in tensors:
+                yield output
+
+    async def run_protocol_task_batched(
+        self,
+        prompt: str,
+        tensor: torch.Tensor,
+        max_retries: Optional[int] = 4,
+    ) -> AsyncIterator[List[torch.Tensor]]:
+        """Same as run_protocol_task, but yields all tensors of each server response at once"""
+        # The request doesn't depend on the server, so it is built once and reused on retries
+        input_stream = inference_protocol_pb2.InferenceRequestAuth(
+            input=prompt,
+            max_new_tokens=5,
+            tensor=serialize_torch_tensor(tensor),
+        )
+
+        # Both limits are optional, and None means retrying indefinitely
+        limits = [limit for limit in (max_retries, self._remote_manager.config.max_retries) if limit is not None]
+        max_attempts = max(1, min(limits)) if limits else None
+        attempts = range(max_attempts) if max_attempts is not None else itertools.count()
+
+        for attempt_no in attempts:
             try:
                 server_session = None
                 # Fetch new server if they don't exist
@@ -50,37 +76,33 @@ class Session:
                 server_session = self._server_session
 
                 # Fetch server stub to call inference on
-                stub = MockProtocol.get_server_stub(
-                    self._remote_manager.state.p2p,
-                    server_session.peer_id,
-                    self.authorizer
-                )
-
-                input_stream = inference_protocol_pb2.InferenceRequestAuth(
-                    input=prompt,
-                    max_new_tokens=5,
-                    tensor=serialize_torch_tensor(tensor),
-                )
+                stub = self._get_stub(server_session.peer_id)
 
-                async with asyncio.Semaphore(float("inf")):
-                    response_stream = await stub.rpc_inference_stream(input_stream)
-                    async for response in response_stream:
-                        for tensor_bytes in response.tensors:
-                            tensor = deserialize_torch_tensor(tensor_bytes)
-                            yield tensor
+                response_stream = await stub.rpc_inference_stream(input_stream)
+                async for response in response_stream:
+                    if response.tensors:
+                        yield [deserialize_torch_tensor(tensor_bytes) for tensor_bytes in response.tensors]
                 return
             except Exception as e:
-                self._remote_manager.on_request_failure(
-                    server_session.peer_id if server_session is not None else None
-                )
-                if attempt_no + 1 == self._remote_manager.config.max_retries or attempt_no + 1 >= max_retries:
+                peer_id = server_session.peer_id if server_session is not None else None
+                if peer_id is not None:
+                    self._stubs.pop(peer_id, None)
+                self._remote_manager.on_request_failure(peer_id)
+                if max_attempts is not None and attempt_no + 1 >= max_attempts:
                     raise
                 delay = self._remote_manager.get_retry_delay(attempt_no)
                 logger.warning(
-                    f"Caught exception when running inference via {server_session.peer_id if server_session is not None else None} "
-                    f"(retry in {delay:.0f} sec): {repr(e)}"
+                    "Caught exception when running inference via %s (retry in %.0f sec): %r", peer_id, delay, e
                 )
-                time.sleep(delay)
+                await asyncio.sleep(delay)
+
+    def _get_stub(self, peer_id: PeerID) -> "InferenceProtocolStub":  # type: ignore # noqa: F821
+        stub = self._stubs.get(peer_id)
+        if stub is None:
+            stub = self._stubs[peer_id] = MockProtocol.get_server_stub(
+                self._remote_manager.state.p2p, peer_id, self.authorizer
+            )
+        return stub
 
     def _update_server(self, attempt_no: int):
         if attempt_no >= 1:
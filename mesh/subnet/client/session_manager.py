@@ -11,7 +11,7 @@ logger = get_logger(__name__)
 
 class SessionManager:
     """
-    Stateless manager: just creates SessionManager instances on demand.
+    Stateless manager: just creates Session instances on demand.
     Does not keep track of sessions or history.
     """
 
@@ -1,7 +1,13 @@
 import asyncio
-from dataclasses import asdict
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 import multiprocessing as mp
-from typing import Any, Dict, List, Optional, Tuple
+import os
+import random
+import socket
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
 
 from mesh import DHT
 from mesh.dht.validation import RecordValidatorBase
@@ -10,7 +16,7 @@ from mesh.subnet.consensus.utils import compare_consensus_data, did_node_attest
 from mesh.subnet.utils.consensus import ConsensusScores
 from mesh.subnet.utils.mock_commit_reveal import SCORES_REVEAL_DEADLINE, VERIFIER_COMMIT_DEADLINE, VERIFIER_REVEAL_DEADLINE
 from mesh.substrate.chain_data import ConsensusData, SubnetNodeConsensusData
-from mesh.substrate.chain_functions import Hypertensor, SubnetNodeClass
+from mesh.substrate.chain_functions import EpochData, Hypertensor, SubnetNodeClass
 from mesh.substrate.config import BLOCK_SECS
 from mesh.substrate.mock.chain_functions import MockHypertensor
 from mesh.substrate.mock.local_chain_functions import LocalMockHypertensor
@@ -19,7 +25,27 @@ from mesh.utils.asyncio import switch_to_uvloop
 
 logger = get_logger(__name__)
 
-class Consensus(mp.Process):
+T = TypeVar("T")
+
+
+def _none_or_int(value: Any) -> Optional[int]:
+    """Normalize an optional integer from the chain (None, "None" or a SCALE value) to Optional[int]"""
+    if value is None:
+        return None
+    value = str(value)
+    return None if value == 'None' else int(value)
+
+# Epoch data only changes once per block, so it is fetched at most once per half a block
+EPOCH_DATA_CACHE_TTL = BLOCK_SECS / 2
+# Upper bound for the exponential backoff between chain retries, see `_backoff_delay`
+MAX_RETRY_DELAY = 60.0
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter, so that nodes don't retry against the chain in lockstep"""
+    return min(BLOCK_SECS * 2**attempt, MAX_RETRY_DELAY) * (0.5 + random.random())
+
+class Consensus(mp.context.ForkProcess):
     def __init__(
         self,
         dht: DHT,
@@ -37,28 +63,61 @@ class Consensus(mp.Process):
         self.subnet_id = subnet_id
         self.subnet_node_id = subnet_node_id
         self.hypertensor = hypertensor
+        self._is_mock_chain = isinstance(hypertensor, (MockHypertensor, LocalMockHypertensor))
         self.task_commit_reveal = task_commit_reveal
         self.record_validator = record_validator
         self.previous_epoch_data: int | None = None
         self.is_subnet_active: bool = False
         self.skip_activate_subnet = skip_activate_subnet
         self.slot: int | None = None # subnet epoch slot, set in `run_activate_subnet`
-        self.epoch_scores: Dict[int, List[Dict]] = dict() # Scores
+        self.epoch_scores: Dict[int, List[SubnetNodeConsensusData]] = dict() # Scores
+        self._epoch_scores_payload: Dict[int, List[Dict]] = dict()  # `epoch_scores` converted to on-chain dicts
+        self._epoch_data_cache: Optional[Tuple[float, EpochData]] = None  # (monotonic fetch time, epoch data)
+        self._validator_cache: Optional[Tuple[int, int]] = None  # (epoch, elected validator), set once elected
+        self._rpc_executor: Optional[ThreadPoolExecutor] = None  # created in the child process, see `run`
         self.stop = mp.Event()
-        self._inner_pipe, self._outer_pipe = mp.Pipe(duplex=True)
+        # Wakes up the event loop of the consensus process on shutdown: an eventfd where available, a socketpair otherwise
+        self._wake_sockets: Optional[Tuple[socket.socket, socket.socket]] = None
+        if hasattr(os, "eventfd"):
+            self._wake_fd = os.eventfd(0, os.EFD_CLOEXEC | os.EFD_NONBLOCK)
+        else:
+            self._wake_sockets = socket.socketpair()
+            for sock in self._wake_sockets:
+                sock.setblocking(False)
+            self._wake_fd = self._wake_sockets[0].fileno()
+        self._async_stop_event: Optional[asyncio.Event] = None  # created in the child process, see `run`
 
         if start:
             self.start()
 
     def run(self):
         loop = switch_to_uvloop()
-        stop = asyncio.Event()
-        loop.add_reader(self._inner_pipe.fileno(), stop.set)
+        logger.debug("Consensus event loop: %s.%s", type(loop).__module__, type(loop).__qualname__)
+        # The only stop signal inside the process: `shutdown` wakes it up through `self._wake_fd`
+        self._async_stop_event = asyncio.Event()
+
+        def _on_stop():
+            loop.remove_reader(self._wake_fd)
+            self._async_stop_event.set()
+
+        loop.add_reader(self._wake_fd, _on_stop)
+        if self.stop.is_set():
+            self._async_stop_event.set()
+        # Chain calls are blocking, so they run off the event loop. A single worker is used because
+        # Hypertensor shares one substrate connection, which can't serve concurrent requests. Every chain call made
+        # in this process, including those inside TaskCommitReveal, must go through `_rpc`
+        self._rpc_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ConsensusRPC")
 
         try:
             loop.run_until_complete(self._main_loop())
         except KeyboardInterrupt:
             logger.debug("Caught KeyboardInterrupt, shutting down")
+        finally:
+            self._rpc_executor.shutdown(wait=False)
+
+    def _rpc(self, fn: Callable[..., T], *args, **kwargs) -> Awaitable[T]:
+        """Run a blocking Hypertensor call in the RPC thread without stalling the event loop"""
+        return asyncio.get_running_loop().run_in_executor(self._rpc_executor, functools.partial(fn, *args, **kwargs))
 
     async def _main_loop(self):
         if not await self.run_activate_subnet():
@@ -67,18 +126,65 @@ class Consensus(mp.Process):
             return
         await self.run_forever()
 
-    def get_validator(self, epoch: int):
-        validator = self.hypertensor.get_rewards_validator(self.subnet_id, epoch)
+    async def get_validator(self, epoch: int):
+        if self._validator_cache is not None and self._validator_cache[0] == epoch:
+            return self._validator_cache[1]
+        validator = _none_or_int(await self._rpc(self.hypertensor.get_rewards_validator, self.subnet_id, epoch))
+        # The elected validator doesn't change within the epoch
+        if validator is not None:
+            self._validator_cache = (epoch, validator)
         return validator
 
+    async def get_subnet_epoch_data(self) -> EpochData:
+        now = time.monotonic()
+        if self._epoch_data_cache is not None and now - self._epoch_data_cache[0] < EPOCH_DATA_CACHE_TTL:
+            return self._epoch_data_cache[1]
+        epoch_data = await self._rpc(self.hypertensor.get_subnet_epoch_data, self.slot)
+        self._epoch_data_cache = (now, epoch_data)
+        return epoch_data
+
     def get_scores(self, target_epoch: int) -> Optional[List[Any]]:
-        if (target_epoch - 1) in self.epoch_scores:
-            del self.epoch_scores[target_epoch - 1]
         return self.epoch_scores.get(target_epoch, None)
 
+    def prune_scores(self, current_epoch: int):
+        """Forget scores older than the previous epoch, which is the oldest one consensus still uses"""
+        for epoch in [epoch for epoch in self.epoch_scores if epoch < current_epoch - 1]:
+            del self.epoch_scores[epoch]
+            self._epoch_scores_payload.pop(epoch, None)
+
+    def get_scores_payload(self, target_epoch: int) -> List[Dict]:
+        """Scores of `target_epoch` as dicts for the chain, converted once per epoch"""
+        payload = self._epoch_scores_payload.get(target_epoch)
+        if payload is None:
+            payload = [s.to_dict() for s in self.epoch_scores.get(target_epoch, ())]
+            self._epoch_scores_payload[target_epoch] = payload
+        return payload
+
     def _get_attestation_ratio(self, consensus_data: ConsensusData):
         return len(consensus_data.attests) / len(consensus_data.subnet_nodes)
 
+    async def _sleep(self, delay: float) -> bool:
+        """
+        Sleep for `delay` seconds unless the process is stopped earlier
+
+        :returns: False if the stop event was set while waiting
+        """
+        try:
+            await asyncio.wait_for(self._async_stop_event.wait(), timeout=max(0.0, delay))
+            return False
+        except asyncio.TimeoutError:
+            return True
+
+    async def _wait_until_percent(self, epoch_data: EpochData, target_percent: float) -> bool:
+        """
+        Sleep until the epoch is expected to pass `target_percent`, waiting at least one block
+
+        :returns: False if the stop event was set while waiting
+        """
+        return await self._sleep(
+            max(BLOCK_SECS, (target_percent - epoch_data.percent_complete) * epoch_data.seconds_per_epoch)
+        )
+
     async def run_activate_subnet(self):
         """
         Verify subnet is active on-chain before starting consensus
@@ -95,31 +201,33 @@ class Consensus(mp.Process):
         subnet_active = False
         max_errors = 3
         errors_count = 0
-        while not self.stop.is_set():
-            if self.slot is None or self.slot == 'None':  # noqa: E711
+        slot_attempts = 0
+        while not self._async_stop_event.is_set():
+            if self.slot is None:
                 try:
-                    slot = self.hypertensor.get_subnet_slot(self.subnet_id)
-                    if slot == None or slot == 'None':  # noqa: E711
-                        await asyncio.sleep(
-                            BLOCK_SECS
-                        )
-                        continue
-                    self.slot = int(str(slot))
-                    logger.info(f"Subnet running in slot {self.slot}")
+                    slot = _none_or_int(await self._rpc(self.hypertensor.get_subnet_slot, self.subnet_id))
                 except Exception as e:
                     logger.warning(f"Consensus get_subnet_slot={e}", exc_info=True)
+                    slot = None
+                if slot is None:
+                    await self._sleep(_backoff_delay(slot_attempts))
+                    slot_attempts += 1
+                    continue
+                self.slot = slot
+                logger.info(f"Subnet running in slot {self.slot}")
 
-            epoch_data = self.hypertensor.get_epoch_data()
+            epoch_data = await self._rpc(self.hypertensor.get_epoch_data)
             current_epoch = epoch_data.epoch
 
             if current_epoch != last_epoch:
                 # offset_sleep = 0
-                subnet_info = self.hypertensor.get_formatted_subnet_info(self.subnet_id)
-                if subnet_info is None or subnet_info == None:  # noqa: E711
+                subnet_info = await self._rpc(self.hypertensor.get_formatted_subnet_info, self.subnet_id)
+                if subnet_info is None:
                     # None means the subnet is likely deactivated
                     if errors_count > max_errors:
                         logger.warning("Cannot find subnet ID: %s, shutting down", self.subnet_id)
-                        self.shutdown()
+                        self.stop.set()
+                        self._async_stop_event.set()
                         subnet_active = False
                         break
                     else:
@@ -134,9 +242,7 @@ class Consensus(mp.Process):
                 last_epoch = current_epoch
 
             logger.info("Waiting for subnet to be activated. Sleeping until next epoch")
-            await asyncio.sleep(
-                max(0.0, epoch_data.seconds_remaining)
-            )
+            await self._sleep(epoch_data.seconds_remaining)
 
         return subnet_active
 
@@ -150,17 +256,14 @@ class Consensus(mp.Process):
         and be included in the consensus data to graduate to a Validator classed node
         """
         last_epoch = None
-        while not self.stop.is_set():
-            epoch_data = self.hypertensor.get_subnet_epoch_data(self.slot)
+        while not self._async_stop_event.is_set():
+            epoch_data = await self.get_subnet_epoch_data()
             current_epoch = epoch_data.epoch
 
             if current_epoch != last_epoch:
-                nodes = self.hypertensor.get_min_class_subnet_nodes_formatted(self.subnet_id, current_epoch, SubnetNodeClass.Idle)
-                node_found = False
-                for node in nodes:
-                    if node.subnet_node_id == self.subnet_node_id:
-                        node_found = True
-                        break
+                nodes = await self._rpc(self.hypertensor.get_min_class_subnet_nodes_formatted, self.subnet_id, current_epoch, SubnetNodeClass.Idle)
+                subnet_node_id = self.subnet_node_id
+                node_found = any(node.subnet_node_id == subnet_node_id for node in nodes)
 
                 if not node_found:
                     logger.info(
@@ -174,7 +277,7 @@ class Consensus(mp.Process):
 
                 last_epoch = current_epoch
 
-            await asyncio.sleep(epoch_data.seconds_remaining)
+            await self._sleep(epoch_data.seconds_remaining)
 
         return True
 
@@ -182,27 +285,22 @@ class Consensus(mp.Process):
         """
         Loop until a new epoch to found, then run consensus logic
         """
-        self._async_stop_event = asyncio.Event()
         last_epoch = None
         started = False
 
         logger.info("✅ Starting consensus")
 
-        while not self.stop.is_set() and not self._async_stop_event.is_set():
+        while not self._async_stop_event.is_set():
             try:
-                epoch_data = self.hypertensor.get_subnet_epoch_data(self.slot)
+                epoch_data = await self.get_subnet_epoch_data()
+                fetched_at = time.monotonic()
 
                 # Start on fresh epoch
                 if started is False:
                     started = True
-                    try:
-                        await asyncio.wait_for(
-                            self._async_stop_event.wait(),
-                            timeout=epoch_data.seconds_remaining
-                        )
+                    if not await self._sleep(epoch_data.seconds_remaining):
                         break  # Stop event was set
-                    except asyncio.TimeoutError:
-                        continue  # Timeout reached, continue to next iteration
+                    continue
 
                 current_epoch = epoch_data.epoch
                 if current_epoch != last_epoch:
@@ -211,25 +309,15 @@ class Consensus(mp.Process):
 
                     The logic here should be for qualifying nodes (proving work), generating scores, etc.
                     """
-                    # Attest/Validate prev epochs data      ⸺ 0-15%
-                    await self.run_consensus(current_epoch)
-
-                    # Run tasks and commit scores           ⸺ 0-50%
-                    await self.run_task_commit(current_epoch)
-
-                    # Reveal commit                         ⸺ 51-60%
-                    await self.run_task_reveal(current_epoch)
-
-                    # Reveal prev commit scores             ⸺ 51-60%
-                    await self.run_reveal_scores(current_epoch)
-
-                    # Get scores for next epoch             ⸺ 60-100%
-                    _, consensus_formatted_scores = await self.run_verify_and_score_peers(current_epoch)
-
-                    if consensus_formatted_scores:
-                        self.epoch_scores[current_epoch] = consensus_formatted_scores
-                        # Commit scores
-                        await self.run_commit_scores(current_epoch)
+                    self.prune_scores(current_epoch)
+
+                    # Each phase waits for its own percent-complete window, so independent phases run concurrently
+                    await self._run_phases(
+                        # Attest/Validate prev epochs data      ⸺ 0-15%
+                        self.run_consensus(current_epoch),
+                        # Commit, reveal, then score this epoch ⸺ 0-100%
+                        self.run_epoch_tasks(current_epoch),
+                    )
 
                     # Have peers commit scores on this epoch, and reveal on the following
                     # This ensures we know the peers did the work to get the scores and know them
@@ -238,100 +326,125 @@ class Consensus(mp.Process):
 
                     last_epoch = current_epoch
 
-                    # Get fresh epoch data after processing
-                    epoch_data = self.hypertensor.get_subnet_epoch_data(self.slot)
+                # Get fresh epoch data only if processing took long enough for the estimate below to drift
+                elapsed = time.monotonic() - fetched_at
+                if elapsed >= BLOCK_SECS:
+                    epoch_data = await self.get_subnet_epoch_data()
+                    elapsed = 0.0
 
                 # Wait for either stop event or timeout based on remaining time
-                try:
-                    await asyncio.wait_for(
-                        self._async_stop_event.wait(),
-                        timeout=epoch_data.seconds_remaining
-                    )
+                if not await self._sleep(epoch_data.seconds_remaining - elapsed):
                     break  # Stop event was set
-                except asyncio.TimeoutError:
-                    pass  # Timeout reached, continue to next iteration
             except Exception as e:
                 logger.warning(e, exc_info=True)
-                await asyncio.sleep(BLOCK_SECS)
+                await self._sleep(BLOCK_SECS)
 
-    async def run_task_commit(self, current_epoch: int):        
-        while not self.stop.is_set():
-            epoch_data = self.hypertensor.get_subnet_epoch_data(self.slot)
-            _current_epoch = epoch_data.epoch
+    async def _run_phases(self, *phases: Awaitable):
+        """
+        Run epoch phases concurrently. If one of them fails, the others are cancelled before the error is raised,
+        so that a retry never overlaps with phases left over from the previous attempt
+        """
+        tasks = [asyncio.ensure_future(phase) for phase in phases]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def run_epoch_tasks(self, current_epoch: int):
+        """
+        The phases that depend on each other: tasks must be committed before they are revealed,
+        and peers are scored only after the reveal window
+        """
+        # Run tasks and commit scores           ⸺ 0-50%
+        await self.run_task_commit(current_epoch)
 
-            # If next epoch or validator took too long, move onto next steps
-            if _current_epoch != current_epoch or epoch_data.percent_complete > VERIFIER_COMMIT_DEADLINE:
-                break
+        # Reveal commit and prev commit scores  ⸺ 51-60%
+        await self.run_task_reveal(current_epoch)
 
-            await self.task_commit_reveal.call_and_commit_all_tasks(current_epoch)
-            break
+        # Get scores for next epoch             ⸺ 60-100%
+        _, consensus_formatted_scores = await self.run_verify_and_score_peers(current_epoch)
+
+        if consensus_formatted_scores:
+            self.epoch_scores[current_epoch] = consensus_formatted_scores
+            # Commit scores
+            await self.run_commit_scores(current_epoch)
+
+    async def run_task_commit(self, current_epoch: int):
+        if self._async_stop_event.is_set():
+            return
+
+        epoch_data = await self.get_subnet_epoch_data()
+
+        # If next epoch or validator took too long, move onto next steps
+        if epoch_data.epoch != current_epoch or epoch_data.percent_complete > VERIFIER_COMMIT_DEADLINE:
+            return
+
+        await self.task_commit_reveal.call_and_commit_all_tasks(current_epoch)
 
     async def run_task_reveal(self, current_epoch: int):        
-        while not self.stop.is_set():
-            epoch_data = self.hypertensor.get_subnet_epoch_data(self.slot)
+        while not self._async_stop_event.is_set():
+            epoch_data = await self.get_subnet_epoch_data()
             _current_epoch = epoch_data.epoch
+            percent_complete = epoch_data.percent_complete
 
             # If next epoch or validator took too long, move onto next steps
-            if _current_epoch != current_epoch or epoch_data.percent_complete > VERIFIER_REVEAL_DEADLINE:
+            # Tasks and previous scores are revealed together, so the earlier of both deadlines applies
+            if _current_epoch != current_epoch or percent_complete > min(VERIFIER_REVEAL_DEADLINE, SCORES_REVEAL_DEADLINE):
                 break
 
-            if epoch_data.percent_complete <= VERIFIER_COMMIT_DEADLINE:
-                await asyncio.sleep(BLOCK_SECS)
+            if percent_complete <= VERIFIER_COMMIT_DEADLINE:
+                if not await self._wait_until_percent(epoch_data, VERIFIER_COMMIT_DEADLINE):
+                    break
                 continue
 
-            await self.task_commit_reveal.reveal_tasks(current_epoch)
+            await self.task_commit_reveal.reveal_tasks_and_scores(current_epoch)
             break
 
     async def run_commit_scores(self, current_epoch: int):
-        if not self.epoch_scores[current_epoch]:
+        scores = self.epoch_scores.get(current_epoch)
+        if not scores:
             return
 
-        while not self.stop.is_set():
-            epoch_data = self.hypertensor.get_subnet_epoch_data(self.slot)
+        while not self._async_stop_event.is_set():
+            epoch_data = await self.get_subnet_epoch_data()
             _current_epoch = epoch_data.epoch
+            percent_complete = epoch_data.percent_complete
 
             # If next epoch or validator took too long, move onto next steps
             if _current_epoch != current_epoch:
                 break
             
             # Commit scores after reveals
-            if epoch_data.percent_complete <= SCORES_REVEAL_DEADLINE:
-                await asyncio.sleep(BLOCK_SECS)
-                continue
-
-            await self.task_commit_reveal.commit_scores(current_epoch, self.epoch_scores[current_epoch])
-            break
-
-    async def run_reveal_scores(self, current_epoch: int):
-        while not self.stop.is_set():
-            epoch_data = self.hypertensor.get_subnet_epoch_data(self.slot)
-            _current_epoch = epoch_data.epoch
-
-            # If next epoch or validator took too long, move onto next steps
-            if _current_epoch != current_epoch or epoch_data.percent_complete > SCORES_REVEAL_DEADLINE:
-                break
-
-            if epoch_data.percent_complete <= VERIFIER_COMMIT_DEADLINE:
-                await asyncio.sleep(BLOCK_SECS)
+            if percent_complete <= SCORES_REVEAL_DEADLINE:
+                if not await self._wait_until_percent(epoch_data, SCORES_REVEAL_DEADLINE):
+                    break
                 continue
 
-            await self.task_commit_reveal.reveal_scores(current_epoch)
+            await self.task_commit_reveal.commit_scores(current_epoch, scores)
             break
 
     async def run_verify_and_score_peers(self, current_epoch: int) -> Tuple[Optional[List[ConsensusScores]], Optional[List[SubnetNodeConsensusData]]]:
-        while not self.stop.is_set():
-            epoch_data = self.hypertensor.get_subnet_epoch_data(self.slot)
+        while not self._async_stop_event.is_set():
+            epoch_data = await self.get_subnet_epoch_data()
             _current_epoch = epoch_data.epoch
+            percent_complete = epoch_data.percent_complete
 
             # If next epoch or validator took too long, move onto next steps
             if _current_epoch != current_epoch:
                 return None, None
 
-            if epoch_data.percent_complete <= VERIFIER_REVEAL_DEADLINE:
-                await asyncio.sleep(BLOCK_SECS)
+            if percent_complete <= VERIFIER_REVEAL_DEADLINE:
+                if not await self._wait_until_percent(epoch_data, VERIFIER_REVEAL_DEADLINE):
+                    break
                 continue
 
-            return self.task_commit_reveal.verify_and_score_peers(current_epoch)
+            # Queries Hypertensor, so it runs in the RPC thread rather than racing `run_consensus` for the connection
+            return await self._rpc(self.task_commit_reveal.verify_and_score_peers, current_epoch)
+
+        return None, None
 
     async def run_consensus(self, current_epoch: int):
         """
@@ -359,28 +472,30 @@ class Consensus(mp.Process):
 
         validator = None
         # Wait until validator is chosen
-        while not self.stop.is_set():
-            validator = self.get_validator(current_epoch)
-            epoch_data = self.hypertensor.get_subnet_epoch_data(self.slot)
+        for attempt_no in itertools.count():
+            if self._async_stop_event.is_set():
+                break
+            validator, epoch_data = await asyncio.gather(self.get_validator(current_epoch), self.get_subnet_epoch_data())
             _current_epoch = epoch_data.epoch
             if _current_epoch != current_epoch:
                 validator = None
                 break
 
-            if validator is not None or validator != 'None':
+            if validator is not None:
                 break
 
-            # Wait until next block to try again
-            await asyncio.sleep(BLOCK_SECS)
+            # Retry quickly at first, then once per block, returning as soon as the stop event is set
+            if not await self._sleep(min(BLOCK_SECS, 0.5 * 2**attempt_no)):
+                return
 
-        if validator is None or validator == None:  # noqa: E711
+        if validator is None:
             return
 
         if validator == self.subnet_node_id:
             logger.info(f"🎖️ Acting as elected validator for epoch {current_epoch} and proposing an attestation to the blockchain")
 
             # See if attestation proposal submitted
-            consensus_data = self.hypertensor.get_consensus_data_formatted(self.subnet_id, current_epoch)
+            consensus_data = await self._rpc(self.hypertensor.get_consensus_data_formatted, self.subnet_id, current_epoch)
             if consensus_data is not None: # noqa: E711
                 logger.info("Already submitted data, moving to next epoch")
                 return
@@ -403,27 +518,27 @@ class Consensus(mp.Process):
 
                 Any successful epoch following will remove these penalties on the subnet
                 """
-                self.hypertensor.propose_attestation(self.subnet_id, data=[asdict(s) for s in scores])
-            else:
-                self.hypertensor.propose_attestation(self.subnet_id, data=[asdict(s) for s in scores])
+
+            data = self.get_scores_payload(current_epoch - 1)
+            await self._rpc(self.hypertensor.propose_attestation, self.subnet_id, data=data)
 
         elif validator is not None:
             logger.info(f"🗳️ Acting as attestor/voter for epoch {current_epoch}")
             consensus_data = None
-            while not self.stop.is_set():
+            while not self._async_stop_event.is_set():
                 # Check consensus data exists in case attest fails
-                if consensus_data is None or consensus_data == None:  # noqa: E711
-                    consensus_data = self.hypertensor.get_consensus_data_formatted(self.subnet_id, current_epoch)
+                if consensus_data is None:
+                    consensus_data = await self._rpc(self.hypertensor.get_consensus_data_formatted, self.subnet_id, current_epoch)
 
-                epoch_data = self.hypertensor.get_subnet_epoch_data(self.slot)
+                epoch_data = await self.get_subnet_epoch_data()
                 _current_epoch = epoch_data.epoch
 
                 # If next epoch or validator took too long, move onto next steps
                 if _current_epoch != current_epoch or epoch_data.percent_complete > 0.15:
                     break
 
-                if consensus_data is None or consensus_data == None:  # noqa: E711
-                    await asyncio.sleep(BLOCK_SECS)
+                if consensus_data is None:
+                    await self._sleep(BLOCK_SECS)
                     continue
 
                 validator_data = consensus_data.data
@@ -433,7 +548,10 @@ class Consensus(mp.Process):
                 """
 
                 self.previous_epoch_data = None
-                if 1.0 == compare_consensus_data(my_data=scores, validator_data=validator_data):
+                # Both lists hold one entry per node, so lists of different lengths can never fully match
+                if len(scores) == len(validator_data) and 1.0 == compare_consensus_data(
+                    my_data=scores, validator_data=validator_data
+                ):
                     # Update previous epoch to current epoch data
                     self.previous_epoch_data = scores
 
@@ -443,21 +561,29 @@ class Consensus(mp.Process):
                         break
 
                     logger.info(f"✅ Elected validator's data matches for epoch {current_epoch}, attesting their data")
-                    receipt = self.hypertensor.attest(self.subnet_id)
-                    if isinstance(self.hypertensor, MockHypertensor) or isinstance(self.hypertensor, LocalMockHypertensor): # don't check receipt if using mock
+                    receipt = await self._rpc(self.hypertensor.attest, self.subnet_id)
+                    if self._is_mock_chain: # don't check receipt if using mock
                         return
 
                     if receipt.is_success:
                         break
                     else:
-                        await asyncio.sleep(BLOCK_SECS)
+                        await self._sleep(BLOCK_SECS)
                 else:
                     logger.info(f"❌ Data doesn't match validator's for epoch {current_epoch}, moving forward with no attetation")
                     break
 
+    def _wake(self):
+        """Make `self._wake_fd` readable, which sets the async stop event inside the consensus process"""
+        if self._wake_sockets is None:
+            os.eventfd_write(self._wake_fd, 1)
+        else:
+            self._wake_sockets[1].send(b"\0")
+
     def shutdown(self):
         if not self.stop.is_set():
             self.stop.set()
+            self._wake()
 
         if self.is_alive():
             self.join(3)
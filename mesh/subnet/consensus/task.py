@@ -1,21 +1,27 @@
 
 
 import asyncio
-import hashlib
-import os
-import pickle
 import random
-import statistics
-from collections import defaultdict
+import secrets
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from hmac import compare_digest
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from mesh import DHT, PeerID, get_dht_time
+import numpy as np
+
+from mesh import DHT, P2P, PeerID, get_dht_time
 from mesh.dht.validation import RecordValidatorBase
 from mesh.proto import math_pb2
-from mesh.subnet.consensus.utils import compare_consensus_data, did_node_attest, get_attestation_ratio, get_peers_node_id
-from mesh.subnet.protocols.math_protocol import MathProtocol
-from mesh.subnet.utils.consensus import BASE_VALIDATOR_SCORE, EPSILON, ConsensusScores
+from mesh.subnet.consensus.utils import (
+  attester_ids,
+  compare_consensus_data,
+  get_attestation_ratio,
+  score_validators,
+  sha256_digest,
+  sha256_many,
+)
+from mesh.subnet.protocols.math_protocol import MathProtocol, eval_equation
+from mesh.subnet.utils.consensus import ConsensusScores
 from mesh.subnet.utils.mock_commit_reveal import (
   MAX_COMMIT_TIME,
   MAX_REVEAL_TIME,
@@ -30,9 +36,12 @@ from mesh.utils.authorizers.auth import AuthorizerBase
 from mesh.utils.dht import get_node_infos_sig
 from mesh.utils.key import extract_peer_id_from_record_validator
 from mesh.utils.logging import get_logger
+from mesh.utils.serializer import MSGPackSerializer
 
 logger = get_logger(__name__)
 
+SALT_SIZE = 16  # bytes of randomness prepended to every committed payload
+
 
 @dataclass
 class MathData:
@@ -42,6 +51,14 @@ class MathData:
   peer_answer: str
   score: int
 
+  def to_row(self) -> list:
+    """Fields in declaration order, the msgpack wire format of a committed task"""
+    return [self.peer_id, self.equation, self.answer, self.peer_answer, self.score]
+
+  @classmethod
+  def from_row(cls, row: list) -> "MathData":
+    return cls(*row)
+
 class TaskCommitReveal():
     def __init__(
         self,
@@ -50,6 +67,7 @@ class TaskCommitReveal():
         record_validator: RecordValidatorBase,
         subnet_id: int,
         hypertensor: Hypertensor,
+        max_concurrent_tasks: int = 32,
     ):
         self.dht = dht
         self.peer_id = dht.peer_id
@@ -57,9 +75,14 @@ class TaskCommitReveal():
         self.record_validator = record_validator
         self.subnet_id = subnet_id
         self.hypertensor = hypertensor
+        self.max_concurrent_tasks = max_concurrent_tasks  # math RPCs in flight at once in `call_and_commit_all_tasks`
         self.commits: Dict[int, PeerID] = dict() # Epoch -> Peer ID
         self.latest_task_commit = None
         self.latest_scores_commit = {}
+        # (included nodes, by peer_id, by subnet_node_id), see `_index_included_nodes`
+        self._included_nodes_index: Optional[
+            Tuple[List[SubnetNodeInfo], Dict[str, SubnetNodeInfo], Dict[int, SubnetNodeInfo]]
+        ] = None
 
 
     async def call_and_commit_all_tasks(self, current_epoch: int):
@@ -85,38 +108,25 @@ class TaskCommitReveal():
         #
         # In this example the verifier sends an equation to the prover and submits the right answer
         # with the provers answer, and scores them a 1.0 if correct.
-        evals_data: List[MathData] = []
-        for peer_id in node_peer_ids:
-            if peer_id.__eq__(self.peer_id):
-                continue
-            stub = MathProtocol.get_server_stub(
-                p2p,
-                peer_id,
-                self.authorizer
-            )
-            equation = self.generate_task()
-            my_eval = float(eval(equation))
-
-            input = math_pb2.MathRequest(input=equation)
+        semaphore = asyncio.Semaphore(self.max_concurrent_tasks)
+        peer_ids = [peer_id for peer_id in node_peer_ids if peer_id != self.peer_id]
+        results = await asyncio.gather(
+            *(self._eval_peer(p2p, peer_id, semaphore) for peer_id in peer_ids), return_exceptions=True
+        )
 
-            # Call the peer to commit the answer
-            async with asyncio.Semaphore(float("inf")):
-                peer_eval = await stub.rpc_math(input)
+        evals_data: List[MathData] = []
+        for peer_id, result in zip(peer_ids, results):
+            if isinstance(result, MathData):
+                evals_data.append(result)
+            else:
+                logger.warning(f"[TaskCommitReveal] Task call to {peer_id} failed: {result!r}")
 
-            evals_data.append(MathData(
-                peer_id=peer_id,
-                equation=equation,
-                answer=my_eval,
-                peer_answer=peer_eval.output,
-                score=1.0 if my_eval == peer_eval.output else 0.0
-            ))
-        
         if not evals_data:
             return
         
-        evals_bytes = pickle.dumps(evals_data)
-        salt = os.urandom(16)
-        digest = hashlib.sha256(salt + evals_bytes).digest()
+        evals_bytes = MSGPackSerializer.dumps([data.to_row() for data in evals_data])
+        salt = secrets.token_bytes(SALT_SIZE)
+        digest = sha256_digest(salt, evals_bytes)
 
         verifier_commit_key = get_verifier_commit_key(current_epoch)
 
@@ -129,8 +139,8 @@ class TaskCommitReveal():
 
         self.latest_task_commit = {
             "target_epoch": current_epoch,
-            "salt": salt,
-            "bytes": evals_bytes,
+            # Stored as-is by `reveal_tasks`
+            "reveal_payload": {"salt": salt, "bytes": evals_bytes},
         }
 
         if store_ok:
@@ -138,39 +148,47 @@ class TaskCommitReveal():
         else:
             logger.warning(f"[TaskCommitReveal] Commit tasks data failed for epoch {current_epoch}")
 
+    async def _eval_peer(self, p2p: P2P, peer_id: PeerID, semaphore: asyncio.Semaphore) -> MathData:
+        """Send a fresh equation to `peer_id` and score its answer against ours"""
+        stub = MathProtocol.get_server_stub(
+            p2p,
+            peer_id,
+            self.authorizer
+        )
+        equation = self.generate_task()
+        my_eval = eval_equation(equation)
+
+        input = math_pb2.MathRequest(input=equation)
+
+        # Call the peer to commit the answer
+        async with semaphore:
+            peer_eval = await stub.rpc_math(input)
+
+        return MathData(
+            peer_id=peer_id.to_base58(),
+            equation=equation,
+            answer=my_eval,
+            peer_answer=peer_eval.output,
+            score=1.0 if my_eval == peer_eval.output else 0.0
+        )
+
     async def reveal_tasks(self, current_epoch: int):
+        await self._store_reveals(current_epoch, tasks=self._task_reveal(current_epoch))
+
+    def _task_reveal(self, current_epoch: int) -> Optional[Tuple[str, Dict[str, bytes]]]:
+        """(DHT key, payload) revealing this epoch's task commit, if there is one"""
         if (
             not self.latest_task_commit
             or self.latest_task_commit["target_epoch"] != current_epoch
         ):
-            return
-
-        reveal_key = get_verifier_reveal_key(current_epoch)
-
-        reveal_payload = {
-            "salt": self.latest_task_commit["salt"],
-            "bytes": self.latest_task_commit["bytes"],
-        }
-
-        if reveal_payload is None:
-            return
-
-        store_ok = self.dht.store(
-            reveal_key,
-            reveal_payload,
-            get_dht_time() + MAX_REVEAL_TIME * .9,
-            self.record_validator.local_public_key
-        )
+            return None
 
-        if store_ok:
-            logger.info(f"[TaskCommitReveal] Revealed tasks data for epoch {current_epoch}")
-        else:
-            logger.warning(f"[TaskCommitReveal] Revealing tasks data failed for epoch {current_epoch}")
+        return get_verifier_reveal_key(current_epoch), self.latest_task_commit["reveal_payload"]
 
-    async def commit_scores(self, current_epoch: int, scores: Dict):
-        scores_bytes = pickle.dumps(scores)
-        salt = os.urandom(16)
-        digest = hashlib.sha256(salt + scores_bytes).digest()
+    async def commit_scores(self, current_epoch: int, scores: List[SubnetNodeConsensusData]):
+        scores_bytes = MSGPackSerializer.dumps([[s.subnet_node_id, s.score] for s in scores])
+        salt = secrets.token_bytes(SALT_SIZE)
+        digest = sha256_digest(salt, scores_bytes)
 
         scores_commit_key = get_scores_commit_key(current_epoch)
 
@@ -183,8 +201,8 @@ class TaskCommitReveal():
 
         self.latest_scores_commit[current_epoch] = {
             "target_epoch": current_epoch,
-            "salt": salt,
-            "bytes": scores_bytes,
+            # Stored as-is by `reveal_scores`
+            "reveal_payload": {"salt": salt, "bytes": scores_bytes},
         }
 
         if store_ok:
@@ -193,34 +211,90 @@ class TaskCommitReveal():
             logger.warning(f"[TaskCommitReveal] Commit score data failed for epoch {current_epoch}")
 
     async def reveal_scores(self, current_epoch: int):
-        if (
-            not self.latest_scores_commit
-            or self.latest_scores_commit.get(current_epoch - 2, None) is None
-        ):
-            return
+        await self._store_reveals(current_epoch, score=self._scores_reveal(current_epoch))
 
-        logger.info(f"Revealing commit from epoch {current_epoch - 2}, in epoch current_epoch")
+    async def reveal_tasks_and_scores(self, current_epoch: int):
+        """Reveal the task commit and the scores commit together, both are due in the same part of the epoch"""
+        await self._store_reveals(
+            current_epoch, tasks=self._task_reveal(current_epoch), score=self._scores_reveal(current_epoch)
+        )
+
+    def _scores_reveal(self, current_epoch: int) -> Optional[Tuple[str, Dict[str, bytes]]]:
+        """(DHT key, payload) revealing the scores committed 2 epochs ago, if there are any"""
+        commit = self.latest_scores_commit.get(current_epoch - 2)
+        if commit is None:
+            return None
 
-        reveal_key = get_scores_reveal_key(current_epoch)
+        logger.info(f"Revealing commit from epoch {current_epoch - 2}, in epoch {current_epoch}")
 
-        reveal_payload = {
-            "salt": self.latest_scores_commit.get(current_epoch - 2, None)["salt"],
-            "bytes": self.latest_scores_commit.get(current_epoch - 2, None)["bytes"],
-        }
+        return get_scores_reveal_key(current_epoch), commit["reveal_payload"]
 
-        if reveal_payload is None:
+    async def _store_reveals(self, current_epoch: int, **reveals: Optional[Tuple[str, Dict[str, bytes]]]):
+        """
+        Store all given reveals with one `store_many` call
+
+        :param reveals: (DHT key, payload) or None for each kind of reveal, by the name used in the logs
+        """
+        reveals = {name: reveal for name, reveal in reveals.items() if reveal is not None}
+        if not reveals:
             return
-        store_ok = self.dht.store(
-            reveal_key,
-            reveal_payload,
+
+        subkey = self.record_validator.local_public_key
+        keys = [key for key, _ in reveals.values()]
+        store_ok = self.dht.store_many(
+            keys,
+            [payload for _, payload in reveals.values()],
             get_dht_time() + MAX_REVEAL_TIME * .9,
-            self.record_validator.local_public_key
+            subkeys=[subkey] * len(keys),
         )
 
-        if store_ok:
-            logger.info(f"[TaskCommitReveal] Revealed score data for epoch {current_epoch}")
-        else:
-            logger.warning(f"[TaskCommitReveal] Revealing score data failed for epoch {current_epoch}")
+        for name, (key, _) in reveals.items():
+            if store_ok.get((key, subkey)):
+                logger.info(f"[TaskCommitReveal] Revealed {name} data for epoch {current_epoch}")
+            else:
+                logger.warning(f"[TaskCommitReveal] Revealing {name} data failed for epoch {current_epoch}")
+
+    def _verified_reveals(
+        self,
+        commit_records: Any,
+        reveal_records: Any,
+        caller: str,
+        include: Optional[Callable[[str], bool]] = None,
+    ) -> List[Tuple[str, bytes]]:
+        """
+        Match each revealed payload against its commit
+
+        The reveals are collected first and hashed in one `sha256_many` call, then compared to the committed digests.
+
+        :param include: optional filter on the revealing peer's base58 ID, applied before anything is hashed
+        :returns: (base58 peer_id, payload bytes) of every reveal whose hash matches its commit
+        """
+        pending: List[Tuple[str, bytes, bytes, bytes]] = []  # (peer_id, salt, payload, committed digest)
+        for public_key, reveal_data in reveal_records.value.items():
+            peer_id = None
+            try:
+                peer_id = extract_peer_id_from_record_validator(public_key).to_base58()
+                if include is not None and not include(peer_id):
+                    continue
+
+                payload = reveal_data.value
+                salt, payload_bytes = payload["salt"], payload["bytes"]
+                if not isinstance(salt, bytes) or not isinstance(payload_bytes, bytes):
+                    raise TypeError("salt and payload must be bytes")
+                pending.append((peer_id, salt, payload_bytes, commit_records.value[public_key].value))
+            except Exception as e:
+                logger.warning(f"[TaskCommitReveal] Failed to verify or parse scores from {peer_id}, {caller}: {e}")
+
+        digests = sha256_many([salt for _, salt, _, _ in pending], [payload_bytes for _, _, payload_bytes, _ in pending])
+
+        verified: List[Tuple[str, bytes]] = []
+        for (peer_id, _, payload_bytes, committed_digest), recomputed_digest in zip(pending, digests):
+            if not isinstance(committed_digest, bytes) or not compare_digest(committed_digest, recomputed_digest):
+                # Disclude node from consensus
+                logger.warning(f"[TaskCommitReveal] Hash mismatch from validator {peer_id}, skipping {caller}")
+                continue
+            verified.append((peer_id, payload_bytes))
+        return verified
 
     def verify_score_reveals(self, target_epoch: int, included_nodes: List[SubnetNodeInfo]) -> Optional[List[ConsensusScores]]:
         """
@@ -249,43 +323,28 @@ class TaskCommitReveal():
         if attestation_ratio < 0.66:
             return None
         
-        consensus_scores = consensus_data.data
+        # Compared against every revealing peer's scores, so the set is built once
+        consensus_scores = frozenset(consensus_data.data)
 
         # Score each peer based on accuracy of data from the consensus
-        results: Dict[str, List[Dict]] = {}
+        results: Dict[str, List[SubnetNodeConsensusData]] = {}
 
-        # Get all reveal data
-        for public_key, reveal_data in reveal_records.value.items():
-            try:
-                peer_id = extract_peer_id_from_record_validator(public_key)
+        # Only if subnet is in consensus and node attested do we score based on this
+        attesters = attester_ids(consensus_data)
+        included_by_peer_id, _ = self._index_included_nodes(included_nodes)
 
-                # Get peer_id's subnet_node_id
-                subnet_node_id = get_peers_node_id(peer_id, included_nodes)
-
-                # Did node attest
-                attested = did_node_attest(subnet_node_id, consensus_data)
-
-                # If didn't attest, skip
-                # Only if subnet is in consensus and node attested do we score based on this
-                if attested is False:
-                    continue
-
-                payload = reveal_data.value
-                salt = payload["salt"]
-                bytes = payload["bytes"]
-
-                # 1) Verify the commit hash
-                recomputed_digest = hashlib.sha256(salt + bytes).digest()
-                committed_digest = commit_records.value[public_key].value
-
-                if committed_digest != recomputed_digest:
-                    # Disclude node from consensus
-                    logger.warning(f"[TaskCommitReveal] Hash mismatch from validator {peer_id}, skipping verify_score_reveals")
-                    continue
+        def attested(peer_id: str) -> bool:
+            node = included_by_peer_id.get(peer_id)
+            return node is not None and node.subnet_node_id in attesters
 
+        # 1) Verify the commit hashes
+        for peer_id, reveal_bytes in self._verified_reveals(commit_records, reveal_records, "verify_score_reveals", attested):
+            try:
                 # 2) Deserialize the scores
-                raw_data = pickle.loads(bytes)
-                results[peer_id.to_base58()] = raw_data
+                results[peer_id] = [
+                    SubnetNodeConsensusData(subnet_node_id=subnet_node_id, score=score)
+                    for subnet_node_id, score in MSGPackSerializer.loads(reveal_bytes)
+                ]
 
             except Exception as e:
                 logger.warning(f"[TaskCommitReveal] Failed to verify or parse scores from {peer_id}, verify_score_reveals: {e}")
@@ -334,72 +393,44 @@ class TaskCommitReveal():
 
         results: Dict[str, List[MathData]] = {}
 
-        # Get all reveal data
-        for public_key, reveal_data in reveal_records.value.items():
+        # 1) Verify the commit hashes
+        for peer_id, reveal_bytes in self._verified_reveals(commit_records, reveal_records, "verify_and_score_peers"):
             try:
-                peer_id = extract_peer_id_from_record_validator(public_key)
                 logger.debug(f"[TaskCommitReveal] peer_id={peer_id}")
 
-                payload = reveal_data.value
-                salt = payload["salt"]
-                bytes = payload["bytes"]
-
-                # 1) Verify the commit hash
-                recomputed_digest = hashlib.sha256(salt + bytes).digest()
-                committed_digest = commit_records.value[public_key].value
-
-                if committed_digest != recomputed_digest:
-                    # Disclude node from consensus
-                    logger.warning(f"[TaskCommitReveal] Hash mismatch from validator {peer_id}, skipping verify_and_score_peers")
-                    continue
-
                 # 2) Deserialize the scores
-                raw_data = pickle.loads(bytes)
                 # Each peers scores
-                math_data: List[MathData] = [
-                    MathData(
-                        peer_id=data.peer_id.to_base58(),
-                        equation=data.equation,
-                        answer=data.answer,
-                        peer_answer=data.peer_answer,
-                        score=data.score
-                    )
-                    for data in raw_data
-                ]
-                results[peer_id.to_base58()] = math_data
+                math_data: List[MathData] = [MathData.from_row(row) for row in MSGPackSerializer.loads(reveal_bytes)]
+                results[peer_id] = math_data
 
             except Exception as e:
                 logger.warning(f"[TaskCommitReveal] Failed to verify or parse scores from {peer_id}, verify_and_score_peers: {e}")
 
-        # Step 1: Get scores per peer_id
-        peer_scores = defaultdict(list)  # peer_id -> list of scores
-        for round_scores in results.values():
-            for score_obj in round_scores:
-                peer_scores[score_obj.peer_id].append(score_obj.score)
-
-        # Step 2: Compute the mean score per peer
-        peer_means = {
-            peer_id: statistics.mean(scores)
-            for peer_id, scores in peer_scores.items()
-        }
-
-        # Step 3: Compute squared error per peer
-        validator_errors: Dict[str, float] = {}
-        for validator_peer_id, round_scores in results.items():
-            error_sum = 0.0
+        # Flatten every (validator, scored peer, score) entry into parallel arrays
+        validator_peer_ids = list(results)
+        peer_index: Dict[str, int] = {}
+        entry_validators: List[int] = []
+        entry_peers: List[int] = []
+        entry_scores: List[float] = []
+        for i, round_scores in enumerate(results.values()):
             for score_obj in round_scores:
-                mean = peer_means.get(score_obj.peer_id)
-                if mean is not None:
-                    error_sum += (score_obj.score - mean) ** 2
-            validator_errors[validator_peer_id] = error_sum
-
-        # Step 4: Normalize errors and subtract from base score
-        max_error = max(validator_errors.values(), default=1.0)
-
-        validator_scores = {
-            peer_id: max(BASE_VALIDATOR_SCORE - (error / (max_error + EPSILON)), 0.0)
-            for peer_id, error in validator_errors.items()
-        }
+                entry_validators.append(i)
+                entry_peers.append(peer_index.setdefault(score_obj.peer_id, len(peer_index)))
+                entry_scores.append(score_obj.score)
+
+        # Steps 1-4: Mean score per peer, squared error per validator, normalized against the largest error
+        validator_scores = dict(
+            zip(
+                validator_peer_ids,
+                score_validators(
+                    np.asarray(entry_validators, dtype=np.intp),
+                    np.asarray(entry_peers, dtype=np.intp),
+                    np.asarray(entry_scores, dtype=np.float64),
+                    num_validators=len(validator_peer_ids),
+                    num_peers=len(peer_index),
+                ).tolist(),
+            )
+        )
 
         consensus_scores = [
             ConsensusScores(peer_id=peer_id, score=int(score * 1e18))
@@ -426,75 +457,72 @@ class TaskCommitReveal():
         *score_lists: List[SubnetNodeConsensusData],
     ) -> List[SubnetNodeConsensusData]:
         """Average scores across multiple lists of SubnetNodeConsensusData."""
-        aggregated = {}
+        totals: Dict[int, Tuple[int, int]] = {}  # subnet_node_id -> (sum of scores, count)
 
-        # Collect all scores per subnet_node_id
         for score_list in score_lists:
             for entry in score_list:
-                aggregated.setdefault(entry.subnet_node_id, []).append(entry.score)
+                total, count = totals.get(entry.subnet_node_id, (0, 0))
+                totals[entry.subnet_node_id] = (total + entry.score, count + 1)
 
-        # Compute averages
-        averaged = [
+        return [
             SubnetNodeConsensusData(
                 subnet_node_id=node_id,
-                score=sum(scores) // len(scores)  # integer average
+                score=total // count  # integer average
             )
-            for node_id, scores in aggregated.items()
+            for node_id, (total, count) in totals.items()
         ]
 
-        return averaged
+    def _index_included_nodes(
+        self, included_nodes: List[SubnetNodeInfo]
+    ) -> Tuple[Dict[str, SubnetNodeInfo], Dict[int, SubnetNodeInfo]]:
+        """
+        Included nodes by peer_id and by subnet_node_id
+
+        The last index is kept as long as the same `included_nodes` list is passed in, which is the case for all
+        filters of one `verify_and_score_peers` round. The list itself is kept too, so its id can't be reused
+        """
+        cached = self._included_nodes_index
+        if cached is not None and cached[0] is included_nodes:
+            return cached[1], cached[2]
+
+        by_peer_id = {node.peer_id: node for node in included_nodes}
+        by_subnet_node_id = {node.subnet_node_id: node for node in included_nodes}
+        self._included_nodes_index = (included_nodes, by_peer_id, by_subnet_node_id)
+        return by_peer_id, by_subnet_node_id
 
     def filter_and_format_scores_from_peer_id(self, current_epoch: int, scores: List[ConsensusScores], included_nodes: List[SubnetNodeInfo]) -> Tuple[List[ConsensusScores], List[SubnetNodeConsensusData]]:
         """
         Filter scores against the blockchain included subnet nodes
         """
-        # Step 1: Get set of included peer_ids
-        included_peer_ids = {node.peer_id for node in included_nodes}
-        scores_peer_ids = {peer.peer_id for peer in scores}
-
-        filtered_scores = [
-            score_obj
-            for score_obj in scores
-            if score_obj.peer_id in included_peer_ids
-        ]
+        included_by_peer_id, _ = self._index_included_nodes(included_nodes)
 
-        score_map = {s.peer_id: s.score for s in filtered_scores}
-
-        consensus_formatted_scores = [
-            SubnetNodeConsensusData(
-                subnet_node_id=node.subnet_node_id,
-                score=score_map[node.peer_id]
+        filtered_scores: List[ConsensusScores] = []
+        consensus_formatted_scores: List[SubnetNodeConsensusData] = []
+        for score_obj in scores:
+            node = included_by_peer_id.get(score_obj.peer_id)
+            if node is None:
+                continue
+            filtered_scores.append(score_obj)
+            consensus_formatted_scores.append(
+                SubnetNodeConsensusData(subnet_node_id=node.subnet_node_id, score=score_obj.score)
             )
-            for node in included_nodes
-            if node.peer_id in scores_peer_ids
-        ]
 
         return filtered_scores, consensus_formatted_scores
 
     def filter_and_format_scores_from_subnet_node_id(self, scores: List[SubnetNodeConsensusData], included_nodes: List[SubnetNodeInfo]) -> Tuple[List[ConsensusScores], List[SubnetNodeConsensusData]]:
         """
         Filter scores against the blockchain included subnet nodes
-        """        
-        # Step 1: Get set of included subnet_node_ids
-        included_subnet_node_ids = {node.subnet_node_id for node in included_nodes}
-        scores_subnet_node_ids = {peer.subnet_node_id for peer in scores}
-
-        filtered_scores = [
-            score_obj
-            for score_obj in scores
-            if score_obj.subnet_node_id in included_subnet_node_ids
-        ]
-
-        score_map = {s.subnet_node_id: s.score for s in filtered_scores}
+        """
+        _, included_by_subnet_node_id = self._index_included_nodes(included_nodes)
 
-        consensus_formatted_scores = [
-            ConsensusScores(
-                peer_id=node.peer_id,
-                score=score_map[node.subnet_node_id]
-            )
-            for node in included_nodes
-            if node.subnet_node_id in scores_subnet_node_ids
-        ]
+        filtered_scores: List[SubnetNodeConsensusData] = []
+        consensus_formatted_scores: List[ConsensusScores] = []
+        for score_obj in scores:
+            node = included_by_subnet_node_id.get(score_obj.subnet_node_id)
+            if node is None:
+                continue
+            filtered_scores.append(score_obj)
+            consensus_formatted_scores.append(ConsensusScores(peer_id=node.peer_id, score=score_obj.score))
 
         return consensus_formatted_scores, filtered_scores
 
@@ -504,28 +532,7 @@ class TaskCommitReveal():
         """
         included_nodes = self.hypertensor.get_min_class_subnet_nodes_formatted(self.subnet_id, current_epoch, SubnetNodeClass.Included)
 
-        # Step 1: Get set of included peer_ids
-        included_peer_ids = {node.peer_id for node in included_nodes}
-        scores_peer_ids = {peer.peer_id for peer in scores}
-
-        filtered_scores = [
-            score_obj
-            for score_obj in scores
-            if score_obj.peer_id in included_peer_ids
-        ]
-
-        score_map = {s.peer_id: s.score for s in filtered_scores}
-
-        consensus_formatted_scores = [
-            SubnetNodeConsensusData(
-                subnet_node_id=node.subnet_node_id,
-                score=score_map[node.peer_id]
-            )
-            for node in included_nodes
-            if node.peer_id in scores_peer_ids
-        ]
-
-        return filtered_scores, consensus_formatted_scores
+        return self.filter_and_format_scores_from_peer_id(current_epoch, scores, included_nodes)
 
     def generate_task(self):
         """Generates a random arithmetic equation as a string."""
@@ -543,5 +550,5 @@ class TaskCommitReveal():
         equation = f"{num1} {operator} {num2}"
         return equation
 
-    def eval_task(self, equation: str):
-        return eval(equation)
+    def eval_task(self, equation: str) -> float:
+        return eval_equation(equation)
@@ -1,38 +1,95 @@
-from typing import List, Optional
+import hashlib
+from typing import AbstractSet, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+
+from mesh.subnet.utils.consensus import BASE_VALIDATOR_SCORE, EPSILON
 from mesh.substrate.chain_data import ConsensusData, SubnetNodeConsensusData, SubnetNodeInfo
 from mesh import PeerID
 
 
+def sha256_digest(*parts: bytes) -> bytes:
+    """
+    SHA-256 of the concatenated `parts`, fed to the hash one by one instead of being concatenated first.
+    hashlib is backed by OpenSSL, which already picks the SHA extensions of the CPU when they are available
+    """
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part)
+    return h.digest()
+
+
+def sha256_many(salts: Sequence[bytes], payloads: Sequence[bytes]) -> List[bytes]:
+    """`sha256_digest(salt, payload)` for each pair, the single place to plug in a multi-buffer SHA-256 backend"""
+    return [sha256_digest(salt, payload) for salt, payload in zip(salts, payloads)]
+
+
+def score_validators(
+    validator_idx: np.ndarray,
+    peer_idx: np.ndarray,
+    scores: np.ndarray,
+    num_validators: int,
+    num_peers: int,
+    base_score: float = BASE_VALIDATOR_SCORE,
+    epsilon: float = EPSILON,
+) -> np.ndarray:
+    """
+    Score validators by how far the scores they gave are from the mean score of each peer
+
+    Every entry `i` is the score `scores[i]` that validator `validator_idx[i]` gave to peer `peer_idx[i]`.
+
+    :returns: one score per validator, `base_score` minus its squared error normalized by the largest error
+    """
+    # Compute the mean score per peer
+    peer_means = (
+        np.bincount(peer_idx, weights=scores, minlength=num_peers)
+        / np.maximum(np.bincount(peer_idx, minlength=num_peers), 1)
+    )
+
+    # Compute squared error per validator
+    validator_errors = np.bincount(
+        validator_idx, weights=(scores - peer_means[peer_idx]) ** 2, minlength=num_validators
+    )
+
+    # Normalize errors and subtract from base score
+    max_error = validator_errors.max() if len(validator_errors) else 1.0
+    return np.maximum(base_score - validator_errors / (max_error + epsilon), 0.0)
+
+
 def compare_consensus_data(
-    my_data: List[SubnetNodeConsensusData],
-    validator_data: List[SubnetNodeConsensusData],
+    my_data: Iterable[SubnetNodeConsensusData],
+    validator_data: Iterable[SubnetNodeConsensusData],
 ) -> float:
-    validator_data_set = set(frozenset(validator_data))
-    my_data_set = set(frozenset(my_data))
+    """
+    Jaccard similarity of two score lists, from 0.0 (nothing in common) to 1.0 (identical, or both empty)
 
-    intersection = my_data_set & validator_data_set
-    union = my_data_set | validator_data_set
+    `validator_data` may be passed as a (frozen)set to reuse it across many comparisons
+    """
+    my_data_set = set(my_data)
+    validator_data_set = validator_data if isinstance(validator_data, AbstractSet) else set(validator_data)
 
+    union = len(my_data_set | validator_data_set)
     if not union:
-        return 100.0
+        return 1.0
 
-    # Accuracy as a percentage of overlap
-    accuracy = float(len(intersection) / len(union))
-    return accuracy
+    # Accuracy as a fraction of overlap
+    return len(my_data_set & validator_data_set) / union
 
 def get_attestation_ratio(consensus_data: ConsensusData):
     return len(consensus_data.attests) / len(consensus_data.subnet_nodes)
 
+def attester_ids(consensus_data: ConsensusData) -> Set[int]:
+    """Subnet node IDs of all attestors, for repeated `did_node_attest`-style checks on the same consensus data"""
+    return {id for item in consensus_data.attests for id in item}
+
 def did_node_attest(subnet_node_id: int, consensus_data: ConsensusData):
-    for item in consensus_data.attests:
-        for id, _ in item.items():
-            if id == subnet_node_id:
-                return True
-    return False
+    return any(subnet_node_id in item for item in consensus_data.attests)
 
 def get_peers_node_id(peer_id: PeerID, subnet_nodes_info: List[SubnetNodeInfo]) -> Optional[int]:
     """Return the subnet_node_id for the given peer_id, or None if not found."""
+    # Comparing PeerID to str encodes the PeerID to base58 every time, so it is encoded once here
+    peer_id_base58 = peer_id.to_base58()
     return next(
-        (node.subnet_node_id for node in subnet_nodes_info if peer_id.__eq__(node.peer_id)),
+        (node.subnet_node_id for node in subnet_nodes_info if node.peer_id == peer_id_base58),
         None,  # default value if not found
     )
@@ -1,9 +1,8 @@
 import datetime
 import time
 from functools import partial
-from multiprocessing import Process
-from threading import Thread
-from typing import Dict, List
+from threading import Event, Thread
+from typing import Any, Dict, List, Optional
 
 from prometheus_client import Gauge, start_http_server
 
@@ -12,10 +11,13 @@ from mesh.subnet.metrics.config import INITIAL_PEERS, UPDATE_PERIOD
 from mesh.subnet.utils.consensus import OnChainConsensusScore
 from mesh.substrate.chain_functions import Hypertensor
 from mesh.utils.data_structures import RemoteModuleInfo, ServerState
-from mesh.utils.dht import get_node_infos
+from mesh.utils.dht import get_many_node_infos
+from mesh.utils.logging import get_logger
 from mesh.utils.multiaddr import Multiaddr
 from mesh.utils.p2p_utils import check_reachability_parallel, extract_peer_ip_info, get_peers_ips
 
+logger = get_logger(__name__)
+
 
 class MetricsServer:
     def __init__(
@@ -27,67 +29,74 @@ class MetricsServer:
         self.hypertensor = hypertensor
         self.dht = dht
         self.port = port
-        self.process = None
+        self._thread: Optional[Thread] = None
+        self._stop_event = Event()
+        # INITIAL_PEERS is fixed, so the bootstrap peer IDs are parsed once instead of on every heartbeat
+        self.bootstrap_peer_ids: List[PeerID] = list(
+            dict.fromkeys(PeerID.from_base58(Multiaddr(addr)["p2p"]) for addr in INITIAL_PEERS)
+        )
 
         self.heartbeat = Gauge('heartbeat', 'Heartbeat')
         self.subnet_consensus_data = Gauge('subnet_consensus_data', 'Subnet Consensus')
         self.onchain_consensus_data = Gauge('onchain_consensus_data', 'Onchain Consensus')
 
     def start(self):
-        self.process = Process(target=self._run)
-        self.process.start()
-
-    def stop(self):
-        self.running = False
-        if self.process:
-            self.process.terminate()
-            self.process.join()
-
-    def _run(self):
         start_http_server(self.port)
-        print(f"[Metrics] Prometheus exporter started on port {self.port}")
+        logger.info(f"[Metrics] Prometheus exporter started on port {self.port}")
 
-        # Start separate threads for each interval-specific updater
-        Thread(target=self._heartbeat_metrics, daemon=True).start()
-        Thread(target=self._onchain_consensus, daemon=True).start()
-        Thread(target=self._subnet_consensus, daemon=True).start()
+        # The updaters only wait on the DHT and the chain, so one thread in this process runs all of them
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, name="MetricsServer", daemon=True)
+        self._thread.start()
 
-        # Keep the process alive
-        while self.running:
-            time.sleep(1)
-
-    def _heartbeat_metrics(self):
-        while self.running:
-            self.heartbeat.set(self.get_heartbeat_metrics())
-            time.sleep(60)
-
-    def _onchain_consensus(self):
-        while self.running:
-            self.inference_latency_gauge.set(self.get_onchain_consensus())
-            time.sleep(100)
-
-    def _subnet_consensus(self):
-        while self.running:
-            self.cache_hit_ratio.set(self.get_subnet_consensus())
-            time.sleep(600)
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
 
-    def get_heartbeat_metrics(self) -> int:
+    def _run(self):
+        updaters = [
+            (self._update_heartbeat_metrics, 60),
+            (self._update_onchain_consensus, 100),
+            (self._update_subnet_consensus, 600),
+        ]
+        next_runs = [time.monotonic()] * len(updaters)
+
+        while not self._stop_event.is_set():
+            for i, (update, period) in enumerate(updaters):
+                if time.monotonic() >= next_runs[i]:
+                    try:
+                        update()
+                    except Exception as e:
+                        logger.warning(f"[Metrics] {update.__name__} failed: {e}", exc_info=True)
+                    next_runs[i] = time.monotonic() + period
+
+            self._stop_event.wait(max(0.0, min(next_runs) - time.monotonic()))
+
+    def _update_heartbeat_metrics(self):
+        metrics = self.get_heartbeat_metrics()
+        self.heartbeat.set(sum(1 for server in metrics["metrics"] if server["state"] == "online"))
+
+    def _update_onchain_consensus(self):
+        value = self.get_onchain_consensus()
+        if value is not None:
+            self.onchain_consensus_data.set(value)
+
+    def _update_subnet_consensus(self):
+        value = self.get_subnet_consensus()
+        if value is not None:
+            self.subnet_consensus_data.set(value)
+
+    def get_heartbeat_metrics(self) -> Dict[str, Any]:
         start_time = time.perf_counter()
-        bootstrap_peer_ids = []
-        for addr in INITIAL_PEERS:
-            peer_id = PeerID.from_base58(Multiaddr(addr)["p2p"])
-            if peer_id not in bootstrap_peer_ids:
-                bootstrap_peer_ids.append(peer_id)
+        bootstrap_peer_ids = self.bootstrap_peer_ids
 
         reach_infos = self.dht.run_coroutine(partial(check_reachability_parallel, bootstrap_peer_ids))
         bootstrap_states = ["online" if reach_infos[peer_id]["ok"] else "unreachable" for peer_id in bootstrap_peer_ids]
 
-        all_servers: List[RemoteModuleInfo] = []
-        hoster_module_infos = get_node_infos(self.dht, "hoster", latest=True)
-        all_servers.append(hoster_module_infos)
-        validator_module_infos = get_node_infos(self.dht, "validator", latest=True)
-        all_servers.append(validator_module_infos)
-        online_servers = [peer_id for peer_id, span in all_servers.items() if span.state == ServerState.ONLINE]
+        all_servers: List[RemoteModuleInfo] = get_many_node_infos(self.dht, ["hoster", "validator"], latest=True)
+        online_servers = [server.peer_id for server in all_servers if server.server.state == ServerState.ONLINE]
 
         reach_infos.update(self.dht.run_coroutine(partial(check_reachability_parallel, online_servers, fetch_info=True)))
         peers_info = {str(peer.peer_id): {"location": extract_peer_ip_info(str(peer.addrs[0])), "multiaddrs": [str(multiaddr) for multiaddr in peer.addrs]} for peer in self.dht.run_coroutine(get_peers_ips)}
@@ -100,11 +109,13 @@ class MetricsServer:
             server_info = server.server
             role = server_info.role
             public_name = server_info.public_name
-            location = peers_info.get(str(peer_id), None)
-            latitude = location['lat'] if location is not None else None
-            longitude = location['lon'] if location is not None else None
-            country = location['country'] if location is not None else None
-            region = location['region'] if location is not None else None
+            # `extract_peer_ip_info` returns {} when the address has no IPv4 or the lookup failed
+            peer_info = peers_info.get(str(peer_id))
+            location = peer_info["location"] if peer_info is not None else {}
+            latitude = location.get("lat")
+            longitude = location.get("lon")
+            country = location.get("country")
+            region = location.get("region")
 
             data = {
                 "peer_id": peer_id,
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import multiprocessing as mp
+import operator
 from typing import Any, Optional
 
 import mesh
@@ -10,7 +11,7 @@ from mesh.p2p import P2P, P2PContext, PeerID, ServicerBase
 from mesh.proto import dht_pb2, math_pb2, runtime_pb2
 from mesh.substrate.chain_functions import Hypertensor
 from mesh.utils import get_logger
-from mesh.utils.asyncio import switch_to_uvloop
+from mesh.utils.asyncio import NullSemaphore, switch_to_uvloop
 from mesh.utils.authorizers.auth import AuthorizerBase, AuthRole, AuthRPCWrapperStreamer
 from mesh.utils.key import extract_rsa_peer_id_from_ssh
 from mesh.utils.mpfuture import MPFuture
@@ -18,6 +19,18 @@ from mesh.utils.serializer import MSGPackSerializer
 
 logger = get_logger(__name__)
 
+_OPERATORS = {'+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv}
+
+
+def eval_equation(equation: str) -> float:
+    """
+    Evaluate a task equation of the form "<int> <operator> <int>", as produced by `TaskCommitReveal.generate_task`
+
+    The equation comes from another peer, so it is parsed explicitly instead of being passed to `eval`
+    """
+    left, op, right = equation.split()
+    return float(_OPERATORS[op](int(left), int(right)))
+
 
 class MathProtocol(mp.context.ForkProcess, ServicerBase):
 
@@ -49,11 +62,12 @@ class MathProtocol(mp.context.ForkProcess, ServicerBase):
         self._p2p = None
         self.authorizer = authorizer
         self.ready = MPFuture()
-        self.rpc_semaphore = asyncio.Semaphore(parallel_rpc if parallel_rpc is not None else float("inf"))
+        self.rpc_semaphore = asyncio.Semaphore(parallel_rpc) if parallel_rpc is not None else NullSemaphore()
         self._inner_pipe, self._outer_pipe = mp.Pipe(duplex=True)
         self.daemon = True
         self.hypertensor = hypertensor
         self.client = client
+        self._serialized_info: Optional[bytes] = None
 
         if start:
             self.run_in_background(await_ready=True)
@@ -158,14 +172,18 @@ class MathProtocol(mp.context.ForkProcess, ServicerBase):
 
         """
         Add any data you may want to quickly get from a node, such as their roles, etc.
+
+        None of these fields change while the process runs, so the serialized result is built once
         """
-        result = {
-            "version": mesh.__version__,
-            "dht_client_mode": self.dht.client_mode,
-            "role": "server" if not self.client else "client"
-        }
+        if self._serialized_info is None:
+            result = {
+                "version": mesh.__version__,
+                "dht_client_mode": self.dht.client_mode,
+                "role": "server" if not self.client else "client"
+            }
+            self._serialized_info = MSGPackSerializer.dumps(result)
 
-        return runtime_pb2.NodeData(serialized_info=MSGPackSerializer.dumps(result))
+        return runtime_pb2.NodeData(serialized_info=self._serialized_info)
 
     async def call_math(
         self, peer: PeerID, equation: str
@@ -213,5 +231,5 @@ class MathProtocol(mp.context.ForkProcess, ServicerBase):
         return math_pb2.MathResponse(
             peer=self.node_info,
             dht_time=get_dht_time(),
-            output=float(eval(request.input)),
+            output=eval_equation(request.input),
         )
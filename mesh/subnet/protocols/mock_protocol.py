@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import multiprocessing as mp
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 import torch
 
@@ -13,7 +13,7 @@ from mesh.p2p import P2P, P2PContext, PeerID, ServicerBase
 from mesh.proto import dht_pb2, inference_protocol_pb2, runtime_pb2
 from mesh.substrate.chain_functions import Hypertensor
 from mesh.utils import get_logger
-from mesh.utils.asyncio import switch_to_uvloop
+from mesh.utils.asyncio import NullSemaphore, switch_to_uvloop
 from mesh.utils.authorizers.auth import AuthorizerBase, AuthRole, AuthRPCWrapperStreamer
 from mesh.utils.key import extract_rsa_peer_id_from_ssh
 from mesh.utils.mpfuture import MPFuture
@@ -21,6 +21,9 @@ from mesh.utils.serializer import MSGPackSerializer
 
 logger = get_logger(__name__)
 
+STREAM_BATCH_SIZE = 8  # max tokens per streamed inference response
+STREAM_FLUSH_INTERVAL = 0.005  # seconds to wait for more tokens before sending a partial batch
+
 
 class MockProtocol(mp.context.ForkProcess, ServicerBase):
 
@@ -50,19 +53,25 @@ class MockProtocol(mp.context.ForkProcess, ServicerBase):
         self.node_info = dht_pb2.NodeInfo(node_id=self.node_id.to_bytes()) # used in key authorizer
         self.balanced, self.shutdown_timeout = balanced, shutdown_timeout
         self._p2p = None
+        self._stubs: Dict[PeerID, Tuple[P2P, AuthRPCWrapperStreamer]] = {}
         self.authorizer = authorizer
         self.ready = MPFuture()
-        self.rpc_semaphore = asyncio.Semaphore(parallel_rpc if parallel_rpc is not None else float("inf"))
+        self.rpc_semaphore = asyncio.Semaphore(parallel_rpc) if parallel_rpc is not None else NullSemaphore()
         self._inner_pipe, self._outer_pipe = mp.Pipe(duplex=True)
         self.daemon = True
         self.hypertensor = hypertensor
         self.client = client
+        self._serialized_info: Optional[bytes] = None
 
         if start:
             self.run_in_background(await_ready=True)
 
     def run(self):
         torch.set_num_threads(1)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass  # the inter-op pool is already running, e.g. it was started in the parent before fork
         loop = switch_to_uvloop()
         stop = asyncio.Event()
         loop.add_reader(self._inner_pipe.fileno(), stop.set)
@@ -121,6 +130,7 @@ class MockProtocol(mp.context.ForkProcess, ServicerBase):
 
     def shutdown(self):
         if self.is_alive():
+            self._outer_pipe.send("_shutdown")
             self.join(self.shutdown_timeout)
             if self.is_alive():
                 logger.warning(
@@ -162,14 +172,18 @@ class MockProtocol(mp.context.ForkProcess, ServicerBase):
 
         """
         Add any data you may want to quickly get from a node, such as their roles, etc.
+
+        None of these fields change while the process runs, so the serialized result is built once
         """
-        result = {
-            "version": mesh.__version__,
-            "dht_client_mode": self.dht.client_mode,
-            "role": "server" if not self.client else "client"
-        }
+        if self._serialized_info is None:
+            result = {
+                "version": mesh.__version__,
+                "dht_client_mode": self.dht.client_mode,
+                "role": "server" if not self.client else "client"
+            }
+            self._serialized_info = MSGPackSerializer.dumps(result)
 
-        return runtime_pb2.NodeData(serialized_info=MSGPackSerializer.dumps(result))
+        return runtime_pb2.NodeData(serialized_info=self._serialized_info)
 
     async def call_inference_stream(
         self, peer: PeerID, prompt: str, tensor: torch.Tensor
@@ -187,16 +201,31 @@ class MockProtocol(mp.context.ForkProcess, ServicerBase):
 
         try:
             async with self.rpc_semaphore:
-                p2p = await self.dht.replicate_p2p()
-                response_stream = await self.get_stub(p2p, peer).rpc_inference_stream(input_stream)
+                stub = await self._get_cached_stub(peer)
+                response_stream = await stub.rpc_inference_stream(input_stream)
                 async for response in response_stream:
                     for tensor_bytes in response.tensors:
                         tensor = deserialize_torch_tensor(tensor_bytes)
                         yield tensor
         except Exception as e:
+            self._stubs.pop(peer, None)  # rebuild the stub on the next call in case the failure was the connection
             logger.error(f"MockProtocol failed to stream from {peer}: {e}", exc_info=True)
             return
 
+    async def _get_cached_stub(self, peer: PeerID) -> AuthRPCWrapperStreamer:
+        """
+        Return the stub for `peer`, reusing the one built by an earlier call while the P2P replica is unchanged
+
+        The replica itself is cached by DHT.replicate_p2p and only changes when it is first used in a new process
+        """
+        p2p = await self.dht.replicate_p2p()
+        cached = self._stubs.get(peer)
+        if cached is not None and cached[0] is p2p:
+            return cached[1]
+        stub = self.get_stub(p2p, peer)
+        self._stubs[peer] = (p2p, stub)
+        return stub
+
     def should_process_inference(self, tensor: torch.Tensor) -> bool:
         """
         Ensures inference request doesn't match the current epochs random prompt
@@ -225,10 +254,46 @@ class MockProtocol(mp.context.ForkProcess, ServicerBase):
                 if run_inference is False:
                     raise ValueError("Tensor must not match the current validation tensor.")
 
-        async for token_tensor in await self._async_model.submit(tensor):
-            yield inference_protocol_pb2.InferenceResponseAuth(
-                peer=self.node_info,
-                dht_time=get_dht_time(),
-                output=str(token_tensor.item()),
-                tensors=[serialize_torch_tensor(token_tensor)]
-            )
+        # Tokens are sent in batches of up to STREAM_BATCH_SIZE. A partial batch is flushed once the model
+        # has not produced a new token for STREAM_FLUSH_INTERVAL seconds, so slow streams are not held back
+        token_iterator = (await self._async_model.submit(tensor)).__aiter__()
+        pending_tokens = []
+        next_token = asyncio.ensure_future(token_iterator.__anext__())
+        try:
+            while True:
+                done, _ = await asyncio.wait(
+                    {next_token}, timeout=STREAM_FLUSH_INTERVAL if pending_tokens else None
+                )
+                if not done:
+                    yield self._inference_response(pending_tokens)
+                    pending_tokens = []
+                    continue
+
+                try:
+                    pending_tokens.append(next_token.result())
+                except StopAsyncIteration:
+                    break
+                next_token = asyncio.ensure_future(token_iterator.__anext__())
+
+                if len(pending_tokens) >= STREAM_BATCH_SIZE:
+                    yield self._inference_response(pending_tokens)
+                    pending_tokens = []
+        finally:
+            next_token.cancel()
+
+        if pending_tokens:
+            yield self._inference_response(pending_tokens)
+
+    def _inference_response(self, tokens: List[torch.Tensor]) -> inference_protocol_pb2.InferenceResponseAuth:
+        """
+        One streamed response carrying a batch of tokens, `output` holds their comma-separated values
+
+        The batch is moved to the CPU and converted to python values in one go rather than per token
+        """
+        token_batch = torch.stack(tokens).cpu()
+        return inference_protocol_pb2.InferenceResponseAuth(
+            peer=self.node_info,
+            dht_time=get_dht_time(),
+            output=",".join(map(str, token_batch.flatten().tolist())),
+            tensors=[serialize_torch_tensor(token_tensor) for token_tensor in token_batch],
+        )
@@ -1,11 +1,13 @@
-from typing import Dict, List
+from typing import Dict, FrozenSet, List, Optional
+
+import numpy as np
 
 from mesh import DHT
 from mesh.dht.validation import RecordValidatorBase
 from mesh.subnet.utils.consensus import (
     OnChainConsensusScore,
 )
-from mesh.substrate.chain_functions import Hypertensor
+from mesh.substrate.chain_functions import Hypertensor, SubnetNodeClass
 from mesh.utils.data_structures import ServerClass
 from mesh.utils.logging import get_logger
 
@@ -24,6 +26,8 @@ class MockValidator:
         self.record_validator = record_validator
         self.latest_commit = None
         self.hypertensor = hypertensor
+        self.active_node_ids: FrozenSet[str] = frozenset()
+        self._active_nodes_epoch: Optional[int] = None
 
     async def score_nodes(self, current_epoch: int) -> List[OnChainConsensusScore]:
         """
@@ -36,9 +40,16 @@ class MockValidator:
 
         scores = self.dht.get(f"scores_{current_epoch}") or {}
 
+        # Scaled in one pass; truncating to int64 matches int() as long as every score is below ~9.2
+        scaled = np.fromiter(scores.values(), dtype=np.float64, count=len(scores)) * 1e18
+        if len(scaled) > 0 and np.abs(scaled).max() >= 2**63:
+            onchain_scores = [int(score) for score in scaled.tolist()]
+        else:
+            onchain_scores = scaled.astype(np.int64).tolist()
+
         consensus_score_list = [
-            OnChainConsensusScore(node_id=node_id, score=int(score * 1e18))
-            for node_id, score in scores.items()
+            OnChainConsensusScore(subnet_node_id=node_id, score=score)
+            for node_id, score in zip(scores, onchain_scores)
         ]
 
         return consensus_score_list
@@ -47,16 +58,27 @@ class MockValidator:
         """
         Normalize scores for the blockchain
         """
-        total = sum(scores.values())
+        values = np.fromiter(scores.values(), dtype=np.float64, count=len(scores))
+        total = values.sum()
         if total == 0:
-            return {peer_id: 0.0 for peer_id in scores}
-        return {
-            peer_id: (score / total) * target_total
-            for peer_id, score in scores.items()
-        }
+            return dict.fromkeys(scores, 0.0)
+        return dict(zip(scores, (values * (target_total / total)).tolist()))
+
+    def refresh_active_nodes(self, subnet_id: int, current_epoch: int) -> FrozenSet[str]:
+        """
+        Cache the peer IDs of the included subnet nodes, queried from the blockchain at most once per epoch
+        """
+        if self._active_nodes_epoch != current_epoch:
+            included_nodes = self.hypertensor.get_min_class_subnet_nodes_formatted(
+                subnet_id, current_epoch, SubnetNodeClass.Included
+            )
+            self.active_node_ids = frozenset(node.peer_id for node in included_nodes)
+            self._active_nodes_epoch = current_epoch
+        return self.active_node_ids
 
-    def filter_merged_scores(self, scores: Dict[str, float]) -> List[OnChainConsensusScore]:
+    def filter_merged_scores(self, scores: Dict[str, float], subnet_id: int, current_epoch: int) -> Dict[str, float]:
         """
-        Filter scores against the blockchain activated subnet nodes
+        Filter scores against the blockchain activated subnet nodes of `current_epoch`, keeping their order
         """
-        return scores
+        active_node_ids = self.refresh_active_nodes(subnet_id, current_epoch)
+        return {peer_id: score for peer_id, score in scores.items() if peer_id in active_node_ids}
@@ -2,9 +2,8 @@ from __future__ import annotations
 
 import threading
 import time
-from typing import Dict, List, Optional
+from typing import List, Optional
 
-import mesh
 from mesh import DHT, get_dht_time
 from mesh.dht.crypto import SignatureValidator
 from mesh.dht.validation import HypertensorPredicateValidator, RecordValidatorBase
@@ -17,12 +16,11 @@ from mesh.substrate.mock.chain_functions import MockHypertensor
 from mesh.utils.authorizers.auth import AuthorizerBase, SignatureAuthorizer
 from mesh.utils.authorizers.pos_auth import ProofOfStakeAuthorizer
 from mesh.utils.data_structures import ServerClass, ServerInfo, ServerState
-from mesh.utils.dht import declare_node_sig, get_node_infos_sig
+from mesh.utils.dht import declare_node_sig, ping_declared_nodes
 from mesh.utils.key import get_private_key
 from mesh.utils.logging import get_logger
 from mesh.utils.ping import PingAggregator
 from mesh.utils.proof_of_stake import ProofOfStake
-from mesh.utils.random import sample_up_to
 from mesh.utils.reachability import ReachabilityProtocol, check_direct_reachability
 from mesh.utils.timed_storage import MAX_DHT_TIME_DISCREPANCY_SECONDS
 
@@ -343,9 +341,10 @@ class ModuleHeartbeatThread(threading.Thread):
         - Tell the network you're still hear
         - Ping other nodes
         """
+        # Heartbeats are scheduled against fixed monotonic deadlines, so the time spent declaring does not
+        # accumulate as drift from one period to the next
+        next_deadline = time.monotonic()
         while True:
-            start_time = time.perf_counter()
-
             if self.server_info.state != ServerState.OFFLINE:
                 self._ping_next_servers()
                 self.server_info.next_pings = {
@@ -387,12 +386,16 @@ class ModuleHeartbeatThread(threading.Thread):
                 )
             """
 
-            delay = self.update_period - (time.perf_counter() - start_time)
+            next_deadline += self.update_period
+            delay = next_deadline - time.monotonic()
             if delay < 0:
                 logger.warning(
                     f"Declaring node to DHT takes more than --update_period, consider increasing it (currently {self.update_period})"
                 )
-            self.trigger.wait(max(delay, 0))
+                next_deadline -= delay  # declare again right away and schedule the following ones from now
+            if self.trigger.wait(max(delay, 0)):
+                # Woken early by `announce`: this beat replaces the scheduled one, the next follows a full period later
+                next_deadline = time.monotonic()
             self.trigger.clear()
 
     def announce(self, state: ServerState) -> None:
@@ -403,17 +406,7 @@ class ModuleHeartbeatThread(threading.Thread):
                 self.join(timeout=5)
 
 
-    def _ping_next_servers(self) -> Dict[mesh.PeerID, float]:
-        module_infos = get_node_infos_sig(
-            self.dht,
-            uid="node",
-            latest=True
-        )
-        if len(module_infos) == 0:
-            return
-        print("module_infos", module_infos)
-        middle_servers = {info.peer_id for info in module_infos}
-        pinged_servers = set(sample_up_to(middle_servers, self.max_pinged))
-        # discard self
-        pinged_servers.discard(self.dht.peer_id)
-        self.ping_aggregator.ping(list(pinged_servers))
+    def _ping_next_servers(self) -> None:
+        # Listing the declared nodes and pinging a sample of them share a single round trip to the DHT process
+        current_rtts = ping_declared_nodes(self.dht, uid="node", max_pinged=self.max_pinged)
+        self.ping_aggregator.update(current_rtts)
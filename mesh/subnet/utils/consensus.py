@@ -20,6 +20,9 @@ class ConsensusScores:
 # On-chain format
 @dataclass
 class OnChainConsensusScore:
+  # Declared by hand since dataclass(slots=True) requires Python 3.10+, one instance is built per scored node
+  __slots__ = ("subnet_node_id", "score")
+
   subnet_node_id: int
   score: int
 
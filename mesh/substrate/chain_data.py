@@ -1020,6 +1020,10 @@ class SubnetNodeConsensusData:
   subnet_node_id: int
   score: int
 
+  def to_dict(self) -> Dict[str, int]:
+    """Returns the fields as a dict, like ``dataclasses.asdict`` without its recursive deep copy."""
+    return {"subnet_node_id": self.subnet_node_id, "score": self.score}
+
   @classmethod
   def serialize(cls, data_decoded: Any) -> "SubnetNodeConsensusData":
       return cls(**data_decoded.serialize())
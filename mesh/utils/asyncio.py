@@ -197,6 +197,13 @@ async def enter_asynchronously(context: AbstractContextManager):
         yield ret_value
 
 
+class NullSemaphore(AbstractAsyncContextManager):
+    """Drop-in for an unbounded asyncio.Semaphore: entering it never blocks and keeps no waiter state"""
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        return None
+
+
 def cancel_task_if_running(task: Optional[asyncio.Task]) -> None:
     """Safely cancel a task if it's still running and the event loop is available."""
     if task is not None and not task.done():
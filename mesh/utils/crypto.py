@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import base64
+import functools
 import threading
 from abc import ABC, abstractmethod
 from enum import Enum
@@ -188,7 +189,21 @@ class Ed25519PublicKey(PublicKey):
         return cls(key)
 
 
+_OPENSSH_KEY_CLASSES = {b"ssh-rsa": RSAPublicKey, b"ssh-ed25519": Ed25519PublicKey}
+
+
+# Public key objects are immutable, so the parsed keys of recently seen owners are shared between calls
+@functools.lru_cache(maxsize=1024)
 def load_public_key_from_bytes(key_bytes: bytes):
+    # OpenSSH public keys start with their type name, so the right class can be picked without
+    # first failing to parse an Ed25519 key as RSA
+    KeyClass = _OPENSSH_KEY_CLASSES.get(key_bytes.split(b" ", 1)[0])
+    if KeyClass is not None:
+        try:
+            return KeyClass.from_bytes(key_bytes)
+        except (ValueError, TypeError):
+            pass
+
     for KeyClass in (RSAPublicKey, Ed25519PublicKey):
         try:
             return KeyClass.from_bytes(key_bytes)
@@ -63,8 +63,12 @@ class ServerInfo:
     next_pings: Optional[Dict[str, pydantic.confloat(ge=0, strict=True)]] = None # type: ignore
 
     def to_tuple(self) -> Tuple[int, str, float, dict]:
-        extra_info = dataclasses.asdict(self)
-        del extra_info["state"], extra_info["throughput"], extra_info["role"]
+        # Shallow field copy: dataclasses.asdict() would deep-copy next_pings on every heartbeat
+        extra_info = {
+            field.name: getattr(self, field.name)
+            for field in dataclasses.fields(self)
+            if field.name not in ("state", "role", "throughput")
+        }
         return (self.state.value, self.role.value, self.throughput, extra_info)
 
     @classmethod
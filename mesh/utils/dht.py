@@ -5,7 +5,7 @@ from __future__ import annotations
 
 import math
 from functools import partial
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Union
 
 from mesh.dht import DHT, DHTNode, DHTValue
 from mesh.dht.crypto import SignatureValidator
@@ -17,6 +17,8 @@ from mesh.utils.data_structures import NodeHeartbeat, RemoteInfo, RemoteModuleIn
 from mesh.utils.key import (
     extract_peer_id_from_record_validator,
 )
+from mesh.utils.ping import ping_parallel
+from mesh.utils.random import sample_up_to
 
 logger = get_logger(__name__)
 
@@ -89,6 +91,34 @@ async def _get_node_infos(
     uid: Any, # type: ignore
     expiration_time: Optional[DHTExpiration],
     latest: bool,
+) -> List[RemoteModuleInfo]:
+    return await _get_many_node_infos(dht, node, uids=[uid], expiration_time=expiration_time, latest=latest)
+
+def get_many_node_infos(
+    dht: DHT,
+    uids: Sequence[Any],
+    expiration_time: Optional[DHTExpiration] = None,
+    *,
+    latest: bool = False,
+    return_future: bool = False,
+) -> Union[List[RemoteModuleInfo], MPFuture]:
+    """Same as `get_node_infos` for several uids at once, fetched with a single `get_many` and concatenated in order"""
+    return dht.run_coroutine(
+        partial(
+            _get_many_node_infos,
+            uids=list(uids),
+            expiration_time=expiration_time,
+            latest=latest,
+        ),
+        return_future=return_future,
+    )
+
+async def _get_many_node_infos(
+    dht: DHT,
+    node: DHTNode,
+    uids: List[Any],
+    expiration_time: Optional[DHTExpiration],
+    latest: bool,
 ) -> List[RemoteModuleInfo]:
     if latest:
         assert expiration_time is None, "You should define either `expiration_time` or `latest`, not both"
@@ -96,27 +126,23 @@ async def _get_node_infos(
     elif expiration_time is None:
         expiration_time = get_dht_time()
     num_workers = 1 if dht.num_workers is None else 1
-    found: Dict[Any, DHTValue] = await node.get_many([uid], expiration_time, num_workers=num_workers) # type: ignore
-
-    if found[uid] is None:
-        return []
-    peers = []
-    inner_dict = found[uid].value
+    found: Dict[Any, DHTValue] = await node.get_many(uids, expiration_time, num_workers=num_workers) # type: ignore
 
     modules: List[RemoteModuleInfo] = []
-    for subkey, values in inner_dict.items():
-        # If using record validator
-        # caller_peer_id = extract_rsa_peer_id_from_ssh(subkey)
+    for uid in uids:
+        if found[uid] is None:
+            continue
 
-        peers.append(PeerID.from_base58(subkey))
-        server_info = ServerInfo.from_tuple(values.value)
+        for subkey, values in found[uid].value.items():
+            # If using record validator
+            # caller_peer_id = extract_rsa_peer_id_from_ssh(subkey)
 
-        modules.append(
-            RemoteModuleInfo(
-                peer_id=PeerID.from_base58(subkey),
-                server=server_info
+            modules.append(
+                RemoteModuleInfo(
+                    peer_id=PeerID.from_base58(subkey),
+                    server=ServerInfo.from_tuple(values.value)
+                )
             )
-        )
     return modules
 
 def store_data(
@@ -288,6 +314,30 @@ async def _get_node_infos_sig(
 
     return modules
 
+def ping_declared_nodes(
+    dht: DHT,
+    uid: Any,
+    max_pinged: int,
+    *,
+    return_future: bool = False,
+) -> Union[Dict[PeerID, float], MPFuture]:
+    """
+    Ping up to :max_pinged: random nodes declared under :uid:, excluding this node
+
+    Finding the nodes and pinging them happen in one coroutine, i.e. one round trip to the DHT process
+    :returns: RTT in seconds for each pinged peer, math.inf if a peer did not respond
+    """
+    return dht.run_coroutine(
+        partial(_ping_declared_nodes, uid=uid, max_pinged=max_pinged),
+        return_future=return_future,
+    )
+
+async def _ping_declared_nodes(dht: DHT, node: DHTNode, uid: Any, max_pinged: int) -> Dict[PeerID, float]:
+    module_infos = await _get_node_infos_sig(dht, node, uid, expiration_time=None, latest=True)
+    pinged_servers = set(sample_up_to({info.peer_id for info in module_infos}, max_pinged))
+    pinged_servers.discard(node.peer_id)
+    return await ping_parallel(list(pinged_servers), dht, node)
+
 def get_node_heartbeats(
     dht: DHT,
     uid: Any,
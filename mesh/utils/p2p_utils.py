@@ -62,6 +62,7 @@ def get_location(ip_address):
         pass
     return {}
 
+@functools.lru_cache(maxsize=4096)
 def extract_peer_ip_info(multiaddr_str):
     if ip_match := re.search(r"/ip4/(\d+\.\d+\.\d+\.\d+)", multiaddr_str):
         return get_location(ip_match[1])
@@ -68,7 +68,10 @@ class PingAggregator:
         self.lock = threading.Lock()
 
     def ping(self, peer_ids: Sequence[mesh.PeerID], **kwargs) -> None:
-        current_rtts = self.dht.run_coroutine(partial(ping_parallel, peer_ids, **kwargs))
+        self.update(self.dht.run_coroutine(partial(ping_parallel, peer_ids, **kwargs)))
+
+    def update(self, current_rtts: Dict[mesh.PeerID, float]) -> None:
+        """Fold RTTs measured elsewhere, e.g. inside a larger DHT coroutine, into the smoothed estimates"""
         logger.debug(f"Current RTTs: {current_rtts}")
 
         with self.lock:
@@ -1,24 +1,7 @@
-from typing import List
+from mesh.subnet.consensus.utils import compare_consensus_data
 from mesh.substrate.chain_data import SubnetNodeConsensusData
 
 
-def compare_consensus_data(
-    my_data: List[SubnetNodeConsensusData],
-    validator_data: List[SubnetNodeConsensusData],
-) -> float:
-    validator_data_set = set(frozenset(validator_data))
-    my_data_set = set(frozenset(my_data))
-
-    intersection = my_data_set & validator_data_set
-    union = my_data_set | validator_data_set
-
-    if not union:
-        return 100.0
-
-    # Accuracy as a percentage of overlap
-    accuracy = (len(intersection) / len(union)) * 100
-    return accuracy
-
 # pytest tests/test_consensus.py::test_compare_consensus_data_100 -rP
 
 def test_compare_consensus_data_100():
@@ -42,7 +25,7 @@ def test_compare_consensus_data_100():
             score=int(1e18)
         ),
     ]
-    assert 100.0 == compare_consensus_data(my_data, validator_data)
+    assert 1.0 == compare_consensus_data(my_data, validator_data)
 
 # pytest tests/test_consensus.py::test_compare_consensus_data_50 -rP
 
@@ -75,7 +58,7 @@ def test_compare_consensus_data_50():
             score=int(1e18)
         ),
     ]
-    assert 50.0 == compare_consensus_data(my_data, validator_data)
+    assert 0.5 == compare_consensus_data(my_data, validator_data)
 
     validator_data=[
         SubnetNodeConsensusData(
@@ -105,4 +88,45 @@ def test_compare_consensus_data_50():
             score=int(1e18)
         ),
     ]
-    assert 50.0 == compare_consensus_data(my_data, validator_data)
+    assert 0.5 == compare_consensus_data(my_data, validator_data)
+
+# pytest tests/test_consensus.py::test_sha256_digest -rP
+
+def test_sha256_digest():
+    import hashlib
+
+    from mesh.subnet.consensus.utils import sha256_digest
+
+    salt, data = b"\x01" * 16, b"payload"
+    assert sha256_digest(salt, data) == hashlib.sha256(salt + data).digest()
+    assert sha256_digest() == hashlib.sha256().digest()
+
+# pytest tests/test_consensus.py::test_compare_consensus_data_ratio -rP
+
+def test_compare_consensus_data_ratio():
+    a = SubnetNodeConsensusData(subnet_node_id=1, score=int(1e18))
+    b = SubnetNodeConsensusData(subnet_node_id=2, score=int(1e18))
+    c = SubnetNodeConsensusData(subnet_node_id=2, score=0)
+
+    assert compare_consensus_data([], []) == 1.0
+    assert compare_consensus_data([a, b], [b, a]) == 1.0
+    assert compare_consensus_data([a, b], frozenset([a, c])) == 1 / 3
+    assert compare_consensus_data([a], []) == 0.0
+
+# pytest tests/test_consensus.py::test_score_validators -rP
+
+def test_score_validators():
+    import numpy as np
+
+    from mesh.subnet.consensus.utils import score_validators
+
+    # validators 0 and 3 agree, validator 1 scores peer 0 differently, validator 2 gave no scores
+    validator_idx = np.array([0, 0, 1, 1, 3, 3], dtype=np.intp)
+    peer_idx = np.array([0, 1, 0, 1, 0, 1], dtype=np.intp)
+    scores = np.array([1.0, 1.0, 0.0, 1.0, 1.0, 1.0])
+
+    result = score_validators(validator_idx, peer_idx, scores, num_validators=4, num_peers=2, base_score=1.0, epsilon=0.0)
+
+    # peer 0 mean is 2/3: errors are 1/9, 4/9, 0 and 1/9, normalized by the largest error 4/9
+    assert np.allclose(result, [0.75, 0.0, 1.0, 0.75])
+    assert score_validators(*(np.array([], dtype=t) for t in (np.intp, np.intp, float)), 0, 0).shape == (0,)
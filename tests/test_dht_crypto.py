@@ -209,3 +209,40 @@ def test_signing_in_different_process_rsa():
     signed_record = parent_conn.recv()
     assert b"[signature:" in signed_record.value
     assert validator.validate(signed_record, DHTRecordRequestType.POST)
+
+# pytest tests/test_dht_crypto.py::test_signature_validator_field_extraction -rP
+
+def test_signature_validator_field_extraction():
+    validator = SignatureValidator(Ed25519PrivateKey())
+
+    samples = [
+        b"key",
+        b"key[owner:abc]",
+        b"[owner:abc]key[owner:def]",
+        b"[owner:]]",
+        b"[owner:a\nb][owner:c]",
+        b"[owner:abc",
+        b"value[signature:sig]",
+        b"value[signature:sig][signature:other]",
+        b"value[signature:]tail]",
+    ]
+    for sample in samples:
+        assert validator._extract_owners(sample) == validator._PUBLIC_KEY_RE.findall(sample)
+        assert validator._extract_signatures(sample) == validator._SIGNATURE_RE.findall(sample)
+        assert validator._extract_signatures(sample, limit=1) == validator._SIGNATURE_RE.findall(sample)[:1]
+
+        record = DHTRecord(key=b"key", subkey=None, value=sample, expiration_time=get_dht_time() + 10)
+        assert validator.strip_value(record) == validator._SIGNATURE_RE.sub(b"", sample)
+
+# pytest tests/test_dht_crypto.py::test_signature_validator_without_subkey -rP
+
+def test_signature_validator_without_subkey():
+    validator = SignatureValidator(Ed25519PrivateKey())
+
+    plain_record = DHTRecord(key=b"key", subkey=None, value=b"value", expiration_time=get_dht_time() + 10)
+    assert validator.sign_value(plain_record) == plain_record.value
+
+    protected_record = dataclasses.replace(plain_record, key=plain_record.key + validator.local_public_key)
+    signed_record = dataclasses.replace(protected_record, value=validator.sign_value(protected_record))
+    assert validator.validate(signed_record, DHTRecordRequestType.POST)
+    assert validator.strip_value(signed_record) == b"value"
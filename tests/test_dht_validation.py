@@ -94,3 +94,34 @@ def test_composite_validator(validators_for_app):
     assert signed_record.value.count(b"[signature:") == 0
     # Expect failed validation since `unknown_key` is not a part of any schema
     assert not validator.validate(signed_record, DHTRecordRequestType.POST)
+
+
+def test_composite_validator_validate_many(validators_for_app):
+    validator = CompositeValidator(validators_for_app["A"])
+    validator.extend(validators_for_app["B"])
+
+    local_public_key = validators_for_app["A"][0].local_public_key
+    records = [
+        DHTRecord(
+            key=DHTID.generate(source="field_b").to_bytes(),
+            subkey=DHTProtocol.serializer.dumps(local_public_key),
+            value=DHTProtocol.serializer.dumps(value),
+            expiration_time=mesh.get_dht_time() + ttl,
+        )
+        for value, ttl in ((777, 10), (778, 20))
+    ]
+    records.append(
+        DHTRecord(
+            key=DHTID.generate(source="unknown_key").to_bytes(),
+            subkey=DHTProtocol.IS_REGULAR_VALUE,
+            value=DHTProtocol.serializer.dumps(777),
+            expiration_time=mesh.get_dht_time() + 10,
+        )
+    )
+    signed_records = [dataclasses.replace(record, value=validator.sign_value(record)) for record in records]
+    # Tamper with the second record after signing it
+    signed_records[1] = dataclasses.replace(signed_records[1], value=signed_records[0].value)
+
+    results = validator.validate_many(signed_records, DHTRecordRequestType.POST)
+    assert results == [validator.validate(record, DHTRecordRequestType.POST) for record in signed_records]
+    assert results == [True, False, False]